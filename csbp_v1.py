@@ -1,87 +1,1264 @@
 import sys
 import io
+import os
+import argparse
 import json
-
+import zipfile
+import hashlib
+import base64
+import itertools
+import functools
+import time
+import bisect
+import re
+import glob
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import threading
+import tempfile
+import shutil
+import atexit
+import weakref
+import queue
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-    QTableWidgetItem, QPushButton, QLabel, QComboBox, QFileDialog, QMessageBox, QColorDialog,
-    QCheckBox, QDialog, QSizePolicy, QLineEdit, QMenuBar, QAbstractItemView, QSlider
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView,
+    QStyledItemDelegate, QPushButton, QLabel, QComboBox, QFileDialog, QMessageBox, QColorDialog,
+    QCheckBox, QDialog, QSizePolicy, QLineEdit, QMenuBar, QAbstractItemView, QSlider, QProgressDialog,
+    QSpinBox, QInputDialog
+)
+from PySide6.QtGui import (
+    QPixmap, QImage, QAction, QPainter, QColor, QFont, QFontMetrics, QShortcut, QKeySequence, QPdfWriter, QPageSize
 )
-from PySide6.QtGui import QPixmap, QImage, QAction, QPainter, QColor
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QObject, QTimer, QLockFile, QRectF, QSizeF, QMarginsF, QRect, QThread, Signal, QAbstractTableModel, QModelIndex
 
 DEFAULT_FPS = 24
 ROWS_PER_PAGE = 6
 COLS = 4
 TOTAL_PAGES = 4
+THUMBNAIL_CACHE_BYTES = 64 * 1024 * 1024
+EXPORT_SIZE = (1920, 1080)
+EXPORT_WORKERS = os.cpu_count() or 1
+PLAYBACK_PREFETCH = 4  # cuts rendered ahead of the playhead
+CANVAS_REFRESH_HZ = 60  # drawing input is rasterized and repainted at most this often
+UNDO_TILE_SIZE = 64
+UNDO_MEMORY_BYTES = 64 * 1024 * 1024  # drawing history budget per canvas, oldest steps are dropped past it
+IMAGE_MEMORY_BYTES = 256 * 1024 * 1024  # RAM for panel images (encoded + decoded), the rest spills to disk
+WORKING_IMAGE_SIZE = (1920, 1080)  # panels are decoded at most this big for display/playback; export uses the original
+IMAGE_DECODE_WORKERS = 2  # threads decoding imported/loaded panels in the background
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
+AUTOSAVE_INTERVAL_MS = 2000  # how often edits are handed to the autosave journal
+AUTOSAVE_COMPACT_RECORDS = 500  # journal records before the journal is folded into a snapshot
+RECOVERY_DIR = os.path.join(os.path.expanduser("~"), ".csbp", "recovery")
+SPREAD_DPI = 150  # default resolution of exported spreads; the layout itself is resolution independent
+LAZY_IMAGE_LOADING = True  # keep loaded images compressed until a page shows them or playback/export needs them
+
+PROJECT_EXT = ".csbp"
+PROJECT_FORMAT_VERSION = 4  # 2: drawn panels are stored as strokes, 3: entries are named by content hash,
+# 4: saves append to the file, the manifest-<n>.json with the highest n is the current one
+MANIFEST_NAME = "manifest.json"
+MANIFEST_GENERATION = re.compile(r"manifest-(\d+)\.json")
+SAVE_REPACK_WASTE = 0.5  # share of a project file no row uses any more before a save rewrites it whole
+CONTENT_IMAGE_NAME = re.compile(r"images/([0-9a-f]{40})\.png")  # version 3 image entries, named by sha1
+
+
+def compact_json(data):
+    return json.dumps(data, separators=(",", ":"))
+
+
+def content_digest(data, key=None):
+    # sha1 hex of data; store keys of images that came in encoded already are that hash
+    if key is not None and key.startswith("sha1:"):
+        return key[5:]
+    return hashlib.sha1(data).hexdigest()
+
+
+def manifest_generation(names):
+    # a full save writes manifest.json (generation 0), every appending save after it manifest-<n>.json
+    return max((int(match.group(1)) for match in map(MANIFEST_GENERATION.fullmatch, names) if match), default=0)
+
+
+class ProjectArchive:
+    # zip container: small json manifest + one entry per distinct image/drawing, named by content hash so
+    # panels reused across cuts are stored once; images stored as-is (png is already compressed)
+
+    def __init__(self, path, mode="r"):
+        self.path = path
+        self.mode = mode
+        self.zip = zipfile.ZipFile(path, mode, compression=zipfile.ZIP_STORED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.zip.close()
+
+    @staticmethod
+    def entry_sizes(path):
+        # {entry name: bytes in the file} of the project archive at path, {} if it isn't one
+        if not zipfile.is_zipfile(path):
+            return {}
+        with zipfile.ZipFile(path) as archive:
+            return {info.filename: info.compress_size for info in archive.infolist()}
+
+    def read_manifest(self):
+        generation = manifest_generation(self.zip.namelist())
+        with self.zip.open(f"manifest-{generation}.json" if generation else MANIFEST_NAME) as f:
+            return json.load(f)
+
+    def write_manifest(self, data, generation=0):
+        name = f"manifest-{generation}.json" if generation else MANIFEST_NAME
+        self.zip.writestr(name, json.dumps(data), compress_type=zipfile.ZIP_DEFLATED)
+
+    def write_entry(self, name, data):
+        # text (drawings) or image bytes
+        if isinstance(data, str):
+            self.write_text(name, data)
+        else:
+            self.write_image(name, data)
 
+    def read_image(self, name):
+        return self.zip.read(name)
 
-class DrawingWidget(QWidget):
-    # brush, eraser, mouse events, .image, .draw, .brush_color, .brush_size, .eraser_mode, update_pixmap, get_pil_image, etv
+    def open_image(self, name):
+        return self.zip.open(name)
 
-    def __init__(self, width, height, brush_color=(0,0,0,255), brush_size=2, eraser_mode=False, parent=None):
-        super().__init__(parent)
-        self.setFixedSize(width, height)
-        self.image = Image.new("RGBA", (width, height), (255,255,255,255))
-        self.draw = ImageDraw.Draw(self.image)
-        self.brush_color = brush_color
-        self.brush_size = brush_size
-        self.eraser_mode = eraser_mode
-        self.last_pos = None
+    def write_image(self, name, data):
+        self.zip.writestr(name, data)
 
-        self.label = QLabel(self)
-        self.label.setFixedSize(width, height)
-        self.label.move(0,0)
+    def read_json(self, name):
+        with self.zip.open(name) as f:
+            return json.load(f)
 
-        self.update_pixmap()
+    def write_json(self, name, data):
+        self.write_text(name, compact_json(data))
 
-        self.label.mousePressEvent = self.mousePressEvent
-        self.label.mouseMoveEvent = self.mouseMoveEvent
-        self.label.mouseReleaseEvent = self.mouseReleaseEvent
+    def write_text(self, name, text):
+        self.zip.writestr(name, text, compress_type=zipfile.ZIP_DEFLATED)
 
-    def update_pixmap(self):
-        data = self.image.tobytes("raw", "RGBA")
-        qimg = QImage(data, self.image.width, self.image.height, QImage.Format_RGBA8888)
-        pix = QPixmap.fromImage(qimg)
-        self.label.setPixmap(pix)
 
-    def get_pil_image(self):
-        return self.image.copy()
+class LegacyProjectReader:
+    # old .json projects (png hex-dumped inside the json), exposed with the same interface as ProjectArchive
 
+    def __init__(self, path):
+        self.path = path
+        with open(path, "r") as f:
+            data = json.load(f)
+        self.images = {}
+        for p, page_data in enumerate(data.get("pages", [])):
+            for r, row_data in enumerate(page_data.get("rows", [])):
+                img_data_hex = row_data.pop("image_data", None)
+                name = None
+                if img_data_hex:
+                    name = f"legacy/p{p}_r{r}.png"
+                    self.images[name] = bytes.fromhex(img_data_hex)
+                row_data["image"] = name
+        self.manifest = data
 
-    def mouseMoveEvent(self, event):
-        if self.last_pos is not None:
-            pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-            self.draw_line(self.last_pos, pos)
-            self.last_pos = pos
+    def __enter__(self):
+        return self
 
-    def mouseReleaseEvent(self, event):
-        self.last_pos = None
+    def __exit__(self, *exc):
+        self.close()
 
-    def draw_point(self, pos):
-        if self.eraser_mode:
-            self.draw.ellipse(
-                [pos.x() - self.brush_size, pos.y() - self.brush_size,
-                 pos.x() + self.brush_size, pos.y() + self.brush_size],
-                fill=(255, 255, 255, 0))
+    def close(self):
+        self.images = {}
+
+    def read_manifest(self):
+        return self.manifest
+
+    def read_image(self, name):
+        return self.images[name]
+
+    def open_image(self, name):
+        return io.BytesIO(self.images[name])
+
+
+def open_project_file(path):
+    if zipfile.is_zipfile(path):
+        return ProjectArchive(path, "r")
+    return LegacyProjectReader(path)
+
+
+_archive_lock = threading.Lock()  # an appending save vs. image_store reading originals from the same file
+
+
+def read_archive_entry(path, name):
+    with _archive_lock, ProjectArchive(path, "r") as archive:
+        return archive.read_image(name)
+
+
+def encode_png(pil_img):
+    with io.BytesIO() as output:
+        pil_img.save(output, format="PNG")
+        return output.getvalue()
+
+
+_image_versions = itertools.count(1)
+
+
+def new_image_key(encoded=None):
+    # content hash when we have the encoded bytes (survives reloads), otherwise a fresh version number
+    if encoded is not None:
+        return "sha1:" + hashlib.sha1(encoded).hexdigest()
+    return f"v{next(_image_versions)}"
+
+
+STROKE_UNITS = 65535  # stroke points are 16-bit fixed point fractions of the canvas width/height
+
+
+class Stroke:
+    # one brush stroke, independent of the canvas resolution: points as fractions of the canvas size,
+    # the brush radius as a fraction of the canvas height
+    __slots__ = ("points", "radius", "color", "eraser")
+
+    def __init__(self, radius, color=(0, 0, 0, 255), eraser=False, points=None):
+        self.points = points if points is not None else array("H")  # x0, y0, x1, y1, ...
+        self.radius = radius
+        self.color = tuple(color)
+        self.eraser = eraser
+
+    def add_point(self, x, y):
+        # x, y in 0..1; repeats of the last point (mouse jitter inside one unit) aren't kept
+        px = min(STROKE_UNITS, max(0, round(x * STROKE_UNITS)))
+        py = min(STROKE_UNITS, max(0, round(y * STROKE_UNITS)))
+        if len(self.points) >= 2 and self.points[-2] == px and self.points[-1] == py:
+            return
+        self.points.append(px)
+        self.points.append(py)
+
+    def rasterize(self, draw, width, height):
+        fill = (255, 255, 255, 255) if self.eraser else self.color
+        r = max(0.5, self.radius * height)
+        sx = (width - 1) / STROKE_UNITS
+        sy = (height - 1) / STROKE_UNITS
+        xy = [(self.points[i] * sx, self.points[i + 1] * sy) for i in range(0, len(self.points), 2)]
+        if not xy:
+            return
+        x, y = xy[0]
+        draw.ellipse([x - r, y - r, x + r, y + r], fill=fill)
+        if len(xy) > 1:
+            draw.line(xy, fill=fill, width=max(1, round(r * 2)), joint="curve")
+
+    def to_data(self):
+        points = array("H", self.points)
+        if sys.byteorder == "big":
+            points.byteswap()  # stored little-endian
+        return {
+            "radius": self.radius,
+            "color": list(self.color),
+            "eraser": self.eraser,
+            "points": base64.b64encode(points.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        points = array("H")
+        points.frombytes(base64.b64decode(data["points"]))
+        if sys.byteorder == "big":
+            points.byteswap()
+        return cls(data["radius"], data["color"], data.get("eraser", False), points)
+
+
+class StrokeDrawing:
+    # a drawn panel: optional raster underneath (png bytes) plus the strokes on top, replayed at whatever
+    # size it's shown or exported at, so it stays sharp from a cell thumbnail to a 4K export
+    __slots__ = ("size", "base", "strokes")
+
+    def __init__(self, size=(800, 450), base=None, strokes=None):
+        self.size = tuple(size)  # the canvas it was drawn on, for the aspect ratio
+        self.base = base
+        self.strokes = strokes if strokes is not None else []
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    @property
+    def height(self):
+        return self.size[1]
+
+    def render(self, width, height):
+        if self.base is None:
+            img = Image.new("RGBA", (width, height), (255, 255, 255, 255))
         else:
-            self.draw.ellipse(
-                [pos.x() - self.brush_size, pos.y() - self.brush_size,
-                 pos.x() + self.brush_size, pos.y() + self.brush_size],
-                fill=self.brush_color)
-        self.update_pixmap()
+            img = Image.open(io.BytesIO(self.base)).convert("RGBA").resize((width, height), Image.LANCZOS)
+        draw = ImageDraw.Draw(img)
+        for stroke in self.strokes:
+            stroke.rasterize(draw, width, height)
+        return img
 
-    def draw_line(self, start, end):
-        if self.eraser_mode:
-            self.draw.line([start.x(), start.y(), end.x(), end.y()], fill=(255, 255, 255, 0), width=self.brush_size * 2)
+    def to_data(self):
+        return {"size": list(self.size), "strokes": [stroke.to_data() for stroke in self.strokes]}
+
+    @classmethod
+    def from_data(cls, data, base=None):
+        return cls(data.get("size", (800, 450)), base, [Stroke.from_data(s) for s in data.get("strokes", [])])
+
+
+def scale_image(image, width, height):
+    # raster images get resampled, stroke drawings are replayed at the target size
+    width, height = max(1, width), max(1, height)
+    if isinstance(image, StrokeDrawing):
+        return image.render(width, height)
+    return image.resize((width, height), Image.LANCZOS)
+
+
+CUT_DIRTY_DURATION = 1  # Cut.dirty bits
+CUT_DIRTY_DESCRIPTION = 2
+CUT_DIRTY_IMAGE = 4
+
+
+class Cut:
+    # one storyboard row as plain data. durations are whole frames; the image is a handle into image_store
+    # (or a stroke drawing), so a cut never pins a bitmap in memory itself. handles and drawings can be
+    # shared between cuts with the same content, so they are never changed in place: an edit sets a new
+    # one on the edited cut only (copy on write)
+    __slots__ = ("frames", "description", "stored", "drawing", "image_key", "dirty")
+
+    def __init__(self, frames=0, description=""):
+        self.frames = frames
+        self.description = description
+        self.stored = None  # StoredImage
+        self.drawing = None  # StrokeDrawing for drawn panels, used instead of stored
+        self.image_key = None  # for thumbnail_cache
+        self.dirty = 0  # CUT_DIRTY_* bits
+
+    def set_frames(self, frames):
+        if frames != self.frames:
+            self.frames = frames
+            self.dirty |= CUT_DIRTY_DURATION
+
+    def set_description(self, description):
+        if description != self.description:
+            self.description = description
+            self.dirty |= CUT_DIRTY_DESCRIPTION
+
+    def set_image(self, pil_img, encoded=None, clean=False):
+        # encoded: the image's file bytes, if we have them (project file, imported file);
+        # pil_img=None with encoded bytes leaves the cut to be decoded on first use
+        if pil_img is None and encoded is None:
+            self.set_stored(None, clean)
         else:
-            self.draw.line([start.x(), start.y(), end.x(), end.y()], fill=self.brush_color, width=self.brush_size * 2)
-        self.update_pixmap()
+            self.set_stored(image_store.add(pil_img, encoded), clean)
+
+    def set_stored(self, stored, clean=False):
+        # stored: an image_store handle, or None to clear the image
+        self.drawing = None
+        self.stored = stored
+        self.image_key = stored.key if stored is not None else None
+        if not clean:
+            self.dirty |= CUT_DIRTY_IMAGE
+
+    def set_drawing(self, drawing, clean=False):
+        self.stored = None
+        self.drawing = drawing
+        self.image_key = new_image_key()
+        if not clean:
+            self.dirty |= CUT_DIRTY_IMAGE
+
+    def copy(self):
+        # shares the image handle/drawing, which are never modified in place
+        cut = Cut(self.frames, self.description)
+        cut.stored = self.stored
+        cut.drawing = self.drawing
+        cut.image_key = self.image_key
+        return cut
+
+    def has_image(self):
+        return self.stored is not None or self.drawing is not None
+
+    def get_image(self):
+        # always a raster, at working resolution; drawn panels come out at the size they were drawn at
+        if self.drawing is not None:
+            return self.drawing.render(*self.drawing.size)
+        if self.stored is None:
+            return None
+        return image_store.get_image(self.stored)
+
+    def image_source(self):
+        # the drawing, the store handle (see resolve_cut_image) or None. handles are cheap to pass around,
+        # anything that needs the full-quality original fetches it with export_source() when it gets to it
+        return self.drawing if self.drawing is not None else self.stored
+
+    def image_digest(self):
+        # content_digest() of get_encoded(), without reading the bytes when the store key already is it
+        if self.stored is not None and self.stored.key.startswith("sha1:"):
+            return self.stored.key[5:]
+        data = self.get_encoded()
+        return None if data is None else content_digest(data)
+
+    def get_encoded(self):
+        if self.drawing is not None:
+            return self.drawing.base
+        if self.stored is None:
+            return None
+        return image_store.get_blob(self.stored)
+
+
+class Page:
+    __slots__ = ("start_number", "mode", "cuts")
+
+    def __init__(self, start_number=1, mode="upload", cuts=None):
+        self.start_number = start_number
+        self.mode = mode  # "upload" or "draw"
+        self.cuts = cuts if cuts is not None else []
+
+
+class TimelineIndex:
+    # Fenwick tree over cut lengths in project order: the start frame of any cut, range totals and
+    # frame -> cut lookups are O(log n), and changing one length is an O(log n) update instead of a re-sum
+
+    def __init__(self, lengths=()):
+        self.lengths = list(lengths)
+        n = len(self.lengths)
+        self.tree = [0] * (n + 1)
+        for i in range(1, n + 1):  # O(n) build
+            self.tree[i] += self.lengths[i - 1]
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+        self.total = sum(self.lengths)
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def set(self, i, length):
+        delta = length - self.lengths[i]
+        if not delta:
+            return
+        self.lengths[i] = length
+        self.total += delta
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i):
+        # sum of the first i lengths, i.e. the frame cut i starts on
+        result = 0
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def range_total(self, start, end):
+        return self.prefix(end) - self.prefix(start)
+
+    def find(self, frame):
+        # (cut index, frame within the cut) for the cut playing at `frame`; zero-length cuts are never
+        # returned, a frame past the end gives (len, overshoot)
+        pos = 0
+        remaining = frame
+        step = 1 << (len(self.lengths).bit_length() - 1) if self.lengths else 0
+        while step:
+            nxt = pos + step
+            if nxt < len(self.tree) and self.tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return pos, remaining
+
+
+class Project:
+    # the whole storyboard without any Qt: the tables are views onto it, and totals, playback, saving and
+    # export all read from here
+
+    def __init__(self, title="", fps=DEFAULT_FPS, page_count=TOTAL_PAGES, rows_per_page=ROWS_PER_PAGE):
+        self.title = title
+        self.fps = fps
+        self.rows_per_page = rows_per_page
+        self.pages = []
+        self._timeline = None  # built on first use, dropped whenever pages or rows are added
+        self._page_offsets = None
+        self.dirty = set()  # "title", "pages", "mode", "save" (failed); row changes are tracked on the cuts
+        for _ in range(page_count):
+            self.add_page()
+        self.dirty.clear()  # a new project has nothing to save yet
+
+    def add_page(self, start_number=None, mode="upload"):
+        if start_number is None:
+            last = self.pages[-1] if self.pages else None
+            start_number = last.start_number + len(last.cuts) if last else 1
+        page = Page(start_number, mode, [Cut() for _ in range(self.rows_per_page)])
+        self.pages.append(page)
+        self.reindex()
+        self.dirty.add("pages")
+        return page
+
+    def snapshot(self):
+        # a copy of the current state that is safe to save from another thread while editing goes on
+        project = Project(self.title, self.fps, page_count=0, rows_per_page=self.rows_per_page)
+        project.pages = [Page(page.start_number, page.mode, [cut.copy() for cut in page.cuts]) for page in self.pages]
+        return project
+
+    def reindex(self):
+        # call after changing the number of cuts; frame count changes go through set_frames() instead
+        self._timeline = None
+        self._page_offsets = None
+
+    @property
+    def page_offsets(self):
+        # flat index of each page's first cut, plus the cut count at the end
+        if self._page_offsets is None:
+            self._page_offsets = list(itertools.accumulate((len(page.cuts) for page in self.pages), initial=0))
+        return self._page_offsets
+
+    @property
+    def timeline(self):
+        if self._timeline is None:
+            self._timeline = TimelineIndex(cut.frames for page in self.pages for cut in page.cuts)
+        return self._timeline
+
+    def set_frames(self, page_index, row, frames):
+        cut = self.pages[page_index].cuts[row]
+        cut.set_frames(frames)
+        if self._timeline is not None:
+            self._timeline.set(self.page_offsets[page_index] + row, cut.frames)
+
+    def to_frames(self, seconds, frames):
+        return seconds * self.fps + frames
+
+    def split_frames(self, frames):
+        # (seconds, frames) as shown in the duration fields
+        return divmod(frames, self.fps)
+
+    def total_frames(self):
+        return self.timeline.total
+
+    def page_total_frames(self, page_index):
+        offsets = self.page_offsets
+        return self.timeline.range_total(offsets[page_index], offsets[page_index + 1])
+
+    def cut_start(self, page_index, row):
+        # frame the cut starts on in the whole-project timeline
+        return self.timeline.prefix(self.page_offsets[page_index] + row)
+
+    def first_free_cut(self, page_index=0):
+        # (page index, row) of the first cut without an image from page_index on; one past the last page
+        # when they are all taken
+        for index in range(page_index, len(self.pages)):
+            for row, cut in enumerate(self.pages[index].cuts):
+                if not cut.has_image():
+                    return index, row
+        return len(self.pages), 0
+
+    def cuts_from(self, page_index, row, count):
+        # `count` consecutive cuts starting at (page_index, row), running on across pages and adding
+        # pages at the end as needed
+        cuts = []
+        while len(cuts) < count:
+            if page_index == len(self.pages):
+                self.add_page(mode=self.pages[-1].mode)
+            cuts.extend(self.pages[page_index].cuts[row:row + count - len(cuts)])
+            page_index, row = page_index + 1, 0
+        return cuts
+
+    def playback_cuts(self):
+        # (image source, frames, number, description) for every cut that has a duration, see
+        # Cut.image_source(). holds no image data, so it is cheap to build for any project size
+        cuts = []
+        for page in self.pages:
+            for row, cut in enumerate(page.cuts):
+                if cut.frames <= 0:
+                    continue
+                image_source = cut.image_source()
+                cuts.append((image_source, cut.frames, page.start_number + row, cut.description))
+        return cuts
+
+    def is_dirty(self):
+        # anything changed since the last save/load
+        return bool(self.dirty) or any(cut.dirty for page in self.pages for cut in page.cuts)
+
+    def mark_clean(self):
+        self.dirty.clear()
+        for page in self.pages:
+            for cut in page.cuts:
+                cut.dirty = 0
+
+    def set_title(self, title):
+        if title != self.title:
+            self.title = title
+            self.dirty.add("title")
+
+    def set_mode(self, mode):
+        for page in self.pages:
+            if page.mode != mode:
+                page.mode = mode
+                self.dirty.add("mode")
+            if mode == "draw":
+                for cut in page.cuts:
+                    if cut.has_image():
+                        cut.set_image(None)  # Clear uploaded images in draw mode
+
+    def save(self, path):
+        # entries are named by content hash, so when path already holds a project archive a save only
+        # appends the entries it doesn't have yet and a new manifest generation: it costs what the edit
+        # costs. a new or legacy file, or one that is more than SAVE_REPACK_WASTE entries no row uses any
+        # more, is written whole instead
+        data = {
+            "format": "csbp",
+            "version": PROJECT_FORMAT_VERSION,
+            "title": self.title,
+            "fps": self.fps,
+            "pages": []
+        }
+
+        entries = {}  # name -> text, bytes or image_store handle; rows with the same content share one
+        for page in self.pages:
+            page_data = {
+                "start_number": page.start_number,
+                "mode": page.mode,
+                "rows": []
+            }
+            for cut in page.cuts:
+                image_name = None
+                drawing_name = None
+                # images go in as the bytes they were loaded/imported with, never re-encoded
+                if cut.drawing is not None:
+                    if cut.drawing.base is not None:
+                        image_name = f"images/{cut.image_digest()}.png"
+                        entries[image_name] = cut.drawing.base
+                    text = compact_json(cut.drawing.to_data())
+                    drawing_name = f"drawings/{content_digest(text.encode())}.json"
+                    entries[drawing_name] = text
+                elif cut.stored is not None:
+                    image_name = f"images/{cut.image_digest()}.png"
+                    entries[image_name] = cut.stored
+                page_data["rows"].append({
+                    "duration": self.split_frames(cut.frames),
+                    "description": cut.description,
+                    "image": image_name,
+                    "drawing": drawing_name,
+                    "mode": page.mode,
+                })
+            data["pages"].append(page_data)
+
+        sizes = ProjectArchive.entry_sizes(path)
+        waste = sum(size for name, size in sizes.items() if name not in entries)
+        if sizes and waste <= SAVE_REPACK_WASTE * sum(sizes.values()):
+            self.append_archive(path, data, entries, sizes)
+        else:
+            self.write_archive(path, data, entries)
+        self.mark_clean()
+
+    @staticmethod
+    def entry_data(entry):
+        return image_store.get_blob(entry) if isinstance(entry, StoredImage) else entry
+
+    @classmethod
+    def write_archive(cls, path, data, entries):
+        # write next to the target and swap in at the end so a failed save never eats the old file
+        tmp_path = path + ".tmp"
+        try:
+            with ProjectArchive(tmp_path, "w") as archive:
+                for name, entry in entries.items():
+                    archive.write_entry(name, cls.entry_data(entry))
+                archive.write_manifest(data)
+            # originals still read from the old file that the new one doesn't have come into RAM first
+            image_store.detach(os.path.abspath(path), entries)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def append_archive(cls, path, data, entries, sizes):
+        # new entries are fetched before the file is opened (image_store may be reading from it), and the
+        # manifest goes in last, so a save that fails halfway leaves the previous generation current
+        new_entries = [(name, cls.entry_data(entry)) for name, entry in entries.items() if name not in sizes]
+        with _archive_lock, ProjectArchive(path, "a") as archive:
+            for name, entry in new_entries:
+                archive.write_entry(name, entry)
+            archive.write_manifest(data, manifest_generation(sizes) + 1)
+
+    @classmethod
+    def load(cls, path, lazy=LAZY_IMAGE_LOADING, backed=True):
+        # backed: leave the originals in the file and have image_store read them back from there when it
+        # needs them, rather than holding its own copy (in RAM, or spilled to disk past its budget). the
+        # file then has to stay put while the project is open; Project.save takes care of its own target
+        with open_project_file(path) as archive:
+            data = archive.read_manifest()
+            # rows naming the same entry share one copy in memory too: the same image_store handle or
+            # drawing base bytes, and the same StrokeDrawing; cuts never modify these in place
+            images = {}
+            stored_images = {}
+            drawings = {}
+            project = cls(data.get("title", ""), data.get("fps", DEFAULT_FPS), page_count=0)
+            for page_data in data.get("pages", []):
+                mode = page_data.get("mode", "upload")
+                page = project.add_page(page_data.get("start_number"), "draw" if "draw" in mode else "upload")
+                rows = page_data.get("rows", [])
+                page.cuts.extend(Cut() for _ in range(len(rows) - len(page.cuts)))
+                project.reindex()
+                for cut, row_data in zip(page.cuts, rows):
+                    s, f = row_data.get("duration", (0, 0))
+                    cut.frames = project.to_frames(int(s), int(f))
+                    cut.description = row_data.get("description", "")
+                    image_name = row_data.get("image")
+                    drawing_name = row_data.get("drawing")
+                    if drawing_name:
+                        drawing = drawings.get((drawing_name, image_name))
+                        if drawing is None:
+                            if image_name and image_name not in images:
+                                images[image_name] = archive.read_image(image_name)
+                            base = images[image_name] if image_name else None
+                            drawing = StrokeDrawing.from_data(archive.read_json(drawing_name), base)
+                            drawings[drawing_name, image_name] = drawing
+                        cut.set_drawing(drawing, clean=True)
+                    elif image_name:
+                        # the png bytes are kept as they are, an unchanged cut never gets re-encoded on save
+                        stored = stored_images.get(image_name)
+                        if stored is None:
+                            stored = stored_images[image_name] = cls.load_image(archive, image_name, backed)
+                        cut.set_stored(stored, clean=True)
+                        if not lazy:
+                            cut.get_image()
+        while len(project.pages) < TOTAL_PAGES:
+            project.add_page()
+        return project
+
+    @staticmethod
+    def load_image(archive, name, backed):
+        # image_store handle for an image entry; content-named entries of a backed archive aren't read at all
+        if not backed or not isinstance(archive, ProjectArchive):
+            return image_store.add(blob=archive.read_image(name))
+        source = (os.path.abspath(archive.path), name)
+        match = CONTENT_IMAGE_NAME.fullmatch(name)
+        if match:
+            return image_store.add(key="sha1:" + match.group(1), source=source)
+        return image_store.add(blob=archive.read_image(name), source=source)
+
+
+def decode_working_image(data, size=WORKING_IMAGE_SIZE):
+    # decodes only as much of the image as size needs: JPEGs scale down inside the decoder (draft picks
+    # the smallest 1/1..1/8 DCT scale still at least size), other formats get a cheap box reduce() by
+    # the largest whole factor first, and only what is left goes through LANCZOS
+    with Image.open(io.BytesIO(data)) as img:
+        img.draft("RGB", size)
+        if img.mode not in ("L", "LA", "RGB", "RGBA"):
+            img = img.convert("RGBA")  # palette, 1-bit, 16-bit, CMYK...: reduce() doesn't take them
+        factor = min(img.width // size[0], img.height // size[1])
+        if factor >= 2:
+            img = img.reduce(factor)
+        img.thumbnail(size, Image.LANCZOS)
+        return img.convert("RGBA")
+
+
+def verify_image_data(data):
+    # raises unless data looks like an image PIL can decode; checks the headers, decodes no pixels
+    with Image.open(io.BytesIO(data)) as img:
+        img.verify()
+
+
+def natural_sort_key(path):
+    # "shot2.png" before "shot10.png"; digit runs compare as numbers
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", os.path.normpath(path))]
+
+
+def collect_image_files(sources):
+    # image files for a bulk import, naturally sorted: sources are files, folders (their images, not
+    # recursive) or glob patterns, in any mix
+    files = set()
+    for source in sources:
+        if os.path.isdir(source):
+            candidates = (os.path.join(source, name) for name in os.listdir(source))
+        elif glob.has_magic(source):
+            candidates = glob.glob(source)
+        else:
+            candidates = [source]
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+                files.add(os.path.normpath(path))
+    return sorted(files, key=natural_sort_key)
+
+
+class StoredImage:
+    # handle to one image in the ImageStore; cuts hold these and the store decides which parts stay in RAM
+    __slots__ = ("key", "blob", "image", "spill_path", "source", "__weakref__")
+
+    def __init__(self, key):
+        self.key = key
+        self.blob = None  # encoded full-resolution original, when in RAM
+        self.image = None  # decoded at working resolution, when in RAM
+        self.spill_path = None  # copy of the blob on disk once it has been spilled
+        self.source = None  # (archive path, entry name) holding the blob, for images loaded from a project
+
+
+def _remove_spill_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ImageStore:
+    # all panel images live here. decoded copies are kept at WORKING_IMAGE_SIZE and the encoded originals
+    # next to them; when the two together go over max_bytes the least recently used images are dropped
+    # from RAM, to be read back (and decoded again) when something asks. originals that came from a project
+    # file are read back from there, anything else is written to a spill directory first.
+    # thread safe, the player's prefetch workers decode through it. file reads/writes, encoding and
+    # decoding all happen outside the lock, so peek() from a paint never waits on them. the store only
+    # holds handles weakly: once no cut uses an image any more its RAM is given back and its spill file removed
+
+    def __init__(self, max_bytes=IMAGE_MEMORY_BYTES, working_size=WORKING_IMAGE_SIZE):
+        self.max_bytes = max_bytes
+        self.working_size = working_size
+        self.resident = OrderedDict()  # key -> bytes held in RAM, least recently used first
+        self.handles = weakref.WeakValueDictionary()  # key -> StoredImage, as long as a cut uses it
+        self.spilling = set()  # keys being written to the spill directory by trim()
+        self.total_bytes = 0
+        self.spill_dir = None
+        self.spill_names = itertools.count(1)
+        self.lock = threading.RLock()
+
+    def add(self, image=None, blob=None, key=None, source=None):
+        # image: a decoded original (RGBA), blob: its encoded bytes; either one may be missing.
+        # source: (archive path, entry name) the encoded bytes can be read from; with a key (the content
+        # hash) it can stand in for both, nothing is read until something asks for the image
+        key = key or new_image_key(blob)
+        if image is not None and (image.width > self.working_size[0] or image.height > self.working_size[1]):
+            # the original only survives encoded, the working copy is what gets shown
+            if blob is None:
+                blob = encode_png(image)
+            image = self.downscale(image)
+        with self.lock:
+            handle = self.handles.get(key)
+            if handle is None:
+                handle = StoredImage(key)
+                self.handles[key] = handle
+                weakref.finalize(handle, self.release, key)
+                handle.blob = blob
+                handle.image = image
+            if handle.source is None:
+                handle.source = source
+            self.touch(handle)
+        self.trim(keep=handle)
+        return handle
+
+    def downscale(self, image):
+        image = image.copy()
+        image.thumbnail(self.working_size, Image.LANCZOS)  # keeps the aspect ratio
+        return image
+
+    def get_image(self, handle):
+        # working-resolution RGBA, decoded (and paged in from disk) if needed
+        image = self.peek(handle)
+        if image is not None:
+            return image
+        image = decode_working_image(self.get_blob(handle), self.working_size)
+        with self.lock:
+            if handle.image is None:
+                handle.image = image
+                self.touch(handle)
+            image = handle.image
+        self.trim(keep=handle)
+        return image
+
+    def peek(self, handle):
+        # the working image if it is already decoded, None otherwise; never decodes
+        with self.lock:
+            if handle.image is not None and handle.key in self.resident:
+                self.resident.move_to_end(handle.key)
+            return handle.image
+
+    def get_blob(self, handle):
+        # the encoded full-resolution original
+        with self.lock:
+            self.touch(handle)
+            if handle.blob is not None:
+                return handle.blob
+            image, spill_path, source = handle.image, handle.spill_path, handle.source
+        if spill_path is not None:
+            with open(spill_path, "rb") as f:
+                blob = f.read()
+        elif source is not None:
+            blob = read_archive_entry(*source)
+        else:
+            blob = encode_png(image)  # small image created in the app, never encoded
+        with self.lock:
+            if handle.blob is None:
+                handle.blob = blob
+                self.touch(handle)
+            blob = handle.blob
+        self.trim(keep=handle)
+        return blob
+
+    def touch(self, handle):
+        # with the lock held: recount handle's RAM and make it the most recently used
+        nbytes = len(handle.blob) if handle.blob is not None else 0
+        if handle.image is not None:
+            nbytes += handle.image.width * handle.image.height * len(handle.image.getbands())
+        self.total_bytes += nbytes - self.resident.pop(handle.key, 0)
+        if nbytes:
+            self.resident[handle.key] = nbytes
+
+    def trim(self, keep=None):
+        # without the lock held: drop least recently used images until the store is back under budget.
+        # images with nothing on disk yet get their spill file written first, outside the lock
+        while True:
+            with self.lock:
+                if self.total_bytes <= self.max_bytes:
+                    return
+                key = next((k for k in self.resident
+                            if k not in self.spilling and (keep is None or k != keep.key)), None)
+                if key is None:
+                    return
+                victim = self.handles.get(key)
+                if victim is None:
+                    self.release(key)
+                    continue
+                if victim.spill_path is not None or victim.source is not None:
+                    self.drop(victim)
+                    continue
+                self.spilling.add(key)
+                blob, image = victim.blob, victim.image
+            try:
+                path = self.write_spill_file(blob if blob is not None else encode_png(image))
+            finally:
+                with self.lock:
+                    self.spilling.discard(key)
+            weakref.finalize(victim, _remove_spill_file, path)  # gone with the last cut using it
+            with self.lock:
+                victim.spill_path = path
+                self.drop(victim)
+
+    def drop(self, handle):
+        handle.blob = None
+        handle.image = None
+        self.total_bytes -= self.resident.pop(handle.key, 0)
+
+    def release(self, key):
+        # the last cut using the image is gone (weakref.finalize from add())
+        with self.lock:
+            self.total_bytes -= self.resident.pop(key, 0)
+
+    def detach(self, path, keep=()):
+        # path is about to be replaced: originals read from it that the new file won't have under the
+        # same entry name (keep) are read into RAM while they still can be, and spill like any other
+        with self.lock:
+            handles = [handle for handle in self.handles.values()
+                       if handle.source is not None and handle.source[0] == path and handle.source[1] not in keep]
+        for handle in handles:
+            blob = read_archive_entry(*handle.source)
+            with self.lock:
+                if handle.blob is None:
+                    handle.blob = blob
+                handle.source = None
+                self.touch(handle)
+        self.trim()
+
+    def write_spill_file(self, blob):
+        path = os.path.join(self.spill_directory(), f"{next(self.spill_names)}.img")
+        with open(path, "wb") as f:
+            f.write(blob)
+        return path
+
+    def spill_directory(self):
+        with self.lock:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="csbp-images-")
+                atexit.register(shutil.rmtree, self.spill_dir, True)
+            return self.spill_dir
+
+
+image_store = ImageStore()
+
+
+class ImageLoader(QObject):
+    # decodes store images on worker threads; loaded(key) arrives on the GUI thread once the working
+    # image is in the store. asking again for an image that is already on its way is free
+    loaded = Signal(str)
+
+    def __init__(self, store=image_store, workers=IMAGE_DECODE_WORKERS, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.pending = set()  # keys being decoded
+        self.failed = set()  # keys that could not be decoded, not retried
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.loaded.connect(self.on_loaded)
+
+    def request(self, handle):
+        if handle.key in self.pending or handle.key in self.failed:
+            return
+        self.pending.add(handle.key)
+        future = self.executor.submit(self.store.get_image, handle)
+        future.add_done_callback(lambda done, key=handle.key: self.finished(key, done))
+
+    def finished(self, key, future):
+        # worker thread
+        if not future.cancelled() and future.exception() is not None:
+            self.failed.add(key)
+        self.loaded.emit(key)  # queued over to the GUI thread
+
+    def on_loaded(self, key):
+        self.pending.discard(key)
+
+
+class ThumbnailCache:
+    # LRU of ready-made cell thumbnails keyed on (image key, width, height, kind), bounded by pixel bytes
+
+    def __init__(self, max_bytes=THUMBNAIL_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, nbytes):
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        self.entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted_bytes) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+
+thumbnail_cache = ThumbnailCache()
+
+
+class SharedImage:
+    # one RGBA buffer (numpy) seen by PIL as .image and by Qt as .qimage, so drawing and display never copy.
+    # keep the SharedImage (or its .image, which points back at it) alive while either view is in use
+
+    def __init__(self, width, height, fill=(0, 0, 0, 0)):
+        self.array = np.empty((height, width, 4), np.uint8)
+        self.array[:] = fill
+        self.image = Image.frombuffer("RGBA", (width, height), self.array, "raw", "RGBA", 0, 1)
+        self.image.readonly = 0  # otherwise PIL copies the buffer on the first draw and the views drift apart
+        self.image.shared_buffer = self
+        self.qimage = QImage(self.array.data, width, height, width * 4, QImage.Format_RGBA8888)
+
+    @classmethod
+    def from_pil(cls, pil_img):
+        shared = cls(pil_img.width, pil_img.height)
+        shared.image.paste(pil_img.convert("RGBA"), (0, 0))
+        return shared
+
+    @property
+    def width(self):
+        return self.array.shape[1]
+
+    @property
+    def height(self):
+        return self.array.shape[0]
+
+
+def pil_to_qimage(pil_img):
+    # free for SharedImage-backed images; anything else pays a single tobytes() copy
+    shared = getattr(pil_img, "shared_buffer", None)
+    if shared is not None:
+        return shared.qimage
+    if pil_img.mode != "RGBA":
+        pil_img = pil_img.convert("RGBA")
+    data = pil_img.tobytes("raw", "RGBA")
+    qimg = QImage(data, pil_img.width, pil_img.height, pil_img.width * 4, QImage.Format_RGBA8888)
+    qimg.source_data = data  # the QImage only wraps data, keep it around as long as the QImage
+    return qimg
+
+
+def pil_to_qpixmap(pil_img):
+    return QPixmap.fromImage(pil_to_qimage(pil_img))
+
+
+def segment_bbox(start, end, brush_size):
+    # box covering a brush segment/dot, padded a pixel for antialiased edges
+    pad = brush_size + 2
+    return (min(start.x(), end.x()) - pad, min(start.y(), end.y()) - pad,
+            max(start.x(), end.x()) + pad + 1, max(start.y(), end.y()) + pad + 1)
+
+
+def polyline_bbox(points, brush_size):
+    # segment_bbox for a whole run of points
+    pad = brush_size + 2
+    xs = [p.x() for p in points]
+    ys = [p.y() for p in points]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad + 1, max(ys) + pad + 1)
+
+
+class LatencyMeter:
+    # input-to-pixels times of the last `size` repaints, in ms
+
+    def __init__(self, size=240):
+        self.samples = deque(maxlen=size)
+
+    def add(self, nanoseconds):
+        self.samples.append(nanoseconds / 1_000_000)
+
+    def summary(self):
+        # (mean, 95th percentile, max) or None before the first sample
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return sum(ordered) / len(ordered), ordered[int(0.95 * (len(ordered) - 1))], ordered[-1]
+
+
+class TileHistory:
+    # undo/redo for a SharedImage canvas. a step only keeps the tiles its stroke touched, copied just
+    # before their first pixel changed, so undo costs scale with the stroke's area, not the canvas.
+    # undo and redo steps together stay within max_bytes; the oldest undo steps are dropped first
+    # (the most recent one is always kept, however big)
+
+    def __init__(self, array, tile_size=UNDO_TILE_SIZE, max_bytes=UNDO_MEMORY_BYTES):
+        self.array = array  # HxWx4, drawn into in place
+        self.tile_size = tile_size
+        self.max_bytes = max_bytes
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.current = None
+        self.total_bytes = 0
+
+    def tile_slices(self, tile):
+        tx, ty = tile
+        ts = self.tile_size
+        return slice(ty * ts, (ty + 1) * ts), slice(tx * ts, (tx + 1) * ts)
+
+    def begin(self):
+        self.current = {}
+
+    def touch(self, box):
+        # call before drawing into box (left, top, right, bottom)
+        if self.current is None:
+            return
+        height, width = self.array.shape[:2]
+        left, top = max(0, box[0]), max(0, box[1])
+        right, bottom = min(width, box[2]), min(height, box[3])
+        if right <= left or bottom <= top:
+            return
+        ts = self.tile_size
+        for ty in range(top // ts, (bottom - 1) // ts + 1):
+            for tx in range(left // ts, (right - 1) // ts + 1):
+                if (tx, ty) not in self.current:
+                    self.current[(tx, ty)] = self.array[self.tile_slices((tx, ty))].copy()
+
+    def end(self):
+        step, self.current = self.current, None
+        if not step:
+            return False
+        for redo in self.redo_steps:
+            self.total_bytes -= self.step_bytes(redo)
+        self.redo_steps.clear()
+        self.undo_steps.append(step)
+        self.total_bytes += self.step_bytes(step)
+        self.trim()
+        return True
+
+    def trim(self):
+        while self.total_bytes > self.max_bytes and len(self.undo_steps) > 1:
+            self.total_bytes -= self.step_bytes(self.undo_steps.popleft())
+
+    def step_bytes(self, step):
+        return sum(tile.nbytes for tile in step.values())
+
+    def step_box(self, step):
+        ts = self.tile_size
+        xs = [tx for tx, _ in step]
+        ys = [ty for _, ty in step]
+        return (min(xs) * ts, min(ys) * ts, (max(xs) + 1) * ts, (max(ys) + 1) * ts)
+
+    def swap(self, step):
+        # puts the step's tiles back and returns the ones they replaced, i.e. the step the other way round
+        other = {}
+        for tile, pixels in step.items():
+            where = self.tile_slices(tile)
+            other[tile] = self.array[where].copy()
+            self.array[where] = pixels
+        return other
+
+    def undo(self):
+        # box to repaint, None if there's nothing to undo
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.redo_steps.append(self.swap(step))  # same tiles, same size: the total doesn't change
+        return self.step_box(step)
+
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.undo_steps.append(self.swap(step))
+        return self.step_box(step)
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+
+class CanvasView(QWidget):
+    # persistent pixmap of a PIL canvas; strokes only re-upload and repaint the box they touched
+
+    def __init__(self, width, height, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(width, height)
+        self.pixmap = QPixmap(width, height)
+        self.pixmap.fill(Qt.white)
+        self.input_ns = None  # oldest input not on screen yet
+        self.latency = LatencyMeter()
+
+    def mark_input(self, timestamp_ns):
+        if self.input_ns is None:
+            self.input_ns = timestamp_ns
+
+    def set_image(self, pil_img):
+        self.pixmap = pil_to_qpixmap(pil_img)
+        self.update()
+
+    def refresh_region(self, pil_img, box):
+        left = max(0, box[0])
+        top = max(0, box[1])
+        right = min(pil_img.width, box[2])
+        bottom = min(pil_img.height, box[3])
+        if right <= left or bottom <= top:
+            return
+
+        rect = QRect(left, top, right - left, bottom - top)
+        shared = getattr(pil_img, "shared_buffer", None)
+
+        painter = QPainter(self.pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)  # eraser pixels must replace, not blend
+        if shared is not None:
+            # read the dirty rect straight out of the canvas buffer
+            painter.drawImage(rect, shared.qimage, rect)
+        else:
+            painter.drawImage(left, top, pil_to_qimage(pil_img.crop((left, top, right, bottom))))
+        painter.end()
+        self.update(rect)
+
+    def paintEvent(self, event):
+        rect = event.rect()
+        painter = QPainter(self)
+        painter.drawPixmap(rect, self.pixmap, rect)
+        painter.end()
+        if self.input_ns is not None:
+            self.latency.add(time.monotonic_ns() - self.input_ns)
+            self.input_ns = None
+
 
 class BigDrawingDialog(QDialog):
      
-    def __init__(self, pil_image=None, brush_color=(0, 0, 0, 255), brush_size=5, eraser_mode=False, parent=None):
+    def __init__(self, pil_image=None, brush_color=(0, 0, 0, 255), brush_size=5, eraser_mode=False, drawing=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Storyboard Canvas")
         self.resize(800, 450)  # 16:9 estimatied
@@ -91,16 +1268,27 @@ class BigDrawingDialog(QDialog):
         self.canvas_width = 800
         self.canvas_height = 450
 
-        if pil_image is not None:
-            self.image = pil_image.resize((self.canvas_width, self.canvas_height), Image.LANCZOS).copy()
+        # everything drawn here is also recorded as strokes on top of the starting picture, see get_drawing()
+        self.buffer = SharedImage(self.canvas_width, self.canvas_height, (255, 255, 255, 255))
+        if drawing is not None:
+            # the drawing may be shared with other cuts, edits go into a copy of its stroke list
+            self.base = drawing.base
+            self.strokes = list(drawing.strokes)
+            self.buffer.image.paste(drawing.render(self.canvas_width, self.canvas_height), (0, 0))
         else:
-            self.image = Image.new("RGBA", (self.canvas_width, self.canvas_height), (255, 255, 255, 255))
+            self.base = encode_png(pil_image) if pil_image is not None else None
+            self.strokes = []
+            if pil_image is not None:
+                self.buffer.image.paste(pil_image.resize((self.canvas_width, self.canvas_height), Image.LANCZOS).convert("RGBA"), (0, 0))
+        self.current_stroke = None
+        self.redo_strokes = []  # strokes taken back by undo, in redo order
+        self.history = TileHistory(self.buffer.array)
+        self.image = self.buffer.image
         self.draw = ImageDraw.Draw(self.image)
 
-        self.label = QLabel()
-        self.label.setFixedSize(self.canvas_width, self.canvas_height)
-        self.label.setMouseTracking(True)
-        layout.addWidget(self.label)
+        self.canvas = CanvasView(self.canvas_width, self.canvas_height)
+        self.canvas.setMouseTracking(True)
+        layout.addWidget(self.canvas)
 
         toolbar = QHBoxLayout()
 
@@ -121,6 +1309,24 @@ class BigDrawingDialog(QDialog):
         self.eraser_checkbox.toggled.connect(self.eraser_toggled)
         toolbar.addWidget(self.eraser_checkbox)
 
+        self.undo_btn = QPushButton("Undo")
+        self.undo_btn.setAutoDefault(False)
+        self.undo_btn.clicked.connect(self.undo)
+        toolbar.addWidget(self.undo_btn)
+
+        self.redo_btn = QPushButton("Redo")
+        self.redo_btn.setAutoDefault(False)
+        self.redo_btn.clicked.connect(self.redo)
+        toolbar.addWidget(self.redo_btn)
+
+        self.latency_label = QLabel()
+        self.latency_label.setStyleSheet("color: gray;")
+        toolbar.addWidget(self.latency_label)
+
+        QShortcut(QKeySequence.Undo, self, self.undo)
+        QShortcut(QKeySequence.Redo, self, self.redo)
+        QShortcut(QKeySequence("Ctrl+Y"), self, self.redo)
+
         layout.addLayout(toolbar)
 
         btn_layout = QHBoxLayout()
@@ -140,13 +1346,23 @@ class BigDrawingDialog(QDialog):
         self.brush_size = brush_size
         self.eraser_mode = eraser_mode
 
-        self.last_pos = None
+        self.last_pos = None  # last point already rasterized
+        self.pending_points = []  # moves since then, drawn on the next flush
+
+        # mouse/tablet moves can arrive at several hundred Hz; they're buffered and drawn as one polyline
+        # per display frame instead of a rasterize + repaint each
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setTimerType(Qt.PreciseTimer)
+        self.flush_timer.setInterval(1000 // CANVAS_REFRESH_HZ)
+        self.flush_timer.timeout.connect(self.flush_input)
 
         self.update_pixmap()
+        self.update_history_buttons()
 
-        self.label.mousePressEvent = self.mousePressEvent
-        self.label.mouseMoveEvent = self.mouseMoveEvent
-        self.label.mouseReleaseEvent = self.mouseReleaseEvent
+        self.canvas.mousePressEvent = self.mousePressEvent
+        self.canvas.mouseMoveEvent = self.mouseMoveEvent
+        self.canvas.mouseReleaseEvent = self.mouseReleaseEvent
 
 
     def open_color_picker(self):
@@ -161,27 +1377,80 @@ class BigDrawingDialog(QDialog):
         self.eraser_mode = checked
 
     def update_pixmap(self):
-        data = self.image.tobytes("raw", "RGBA")
-        qimg = QImage(data, self.image.width, self.image.height, QImage.Format_RGBA8888)
-        pix = QPixmap.fromImage(qimg)
-        self.label.setPixmap(pix)
+        self.canvas.set_image(self.image)
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
+            self.canvas.mark_input(time.monotonic_ns())
             pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
             self.last_pos = pos
+            self.current_stroke = Stroke(self.brush_size / self.canvas_height, self.brush_color, self.eraser_mode)
+            self.strokes.append(self.current_stroke)
+            self.history.begin()
+            self.record_point(pos)
             self.draw_point(pos)
 
     def mouseMoveEvent(self, event):
         if self.last_pos is not None:
+            self.canvas.mark_input(time.monotonic_ns())
             pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-            self.draw_line(self.last_pos, pos)
-            self.last_pos = pos
+            self.record_point(pos)  # every point goes into the stroke, batching only affects the screen
+            self.pending_points.append(pos)
+            if not self.flush_timer.isActive():
+                self.flush_timer.start()
+
+    def flush_input(self):
+        self.flush_timer.stop()
+        if not self.pending_points or self.last_pos is None:
+            return
+        points = [self.last_pos] + self.pending_points
+        self.pending_points = []
+        self.draw_polyline(points)
+        self.last_pos = points[-1]
 
     def mouseReleaseEvent(self, event):
+        self.flush_input()
+        self.update_latency_label()
+        if self.current_stroke is not None and self.history.end():
+            self.redo_strokes.clear()
         self.last_pos = None
+        self.current_stroke = None
+        self.update_history_buttons()
+
+    def undo(self):
+        if self.last_pos is not None:
+            return  # not in the middle of a stroke
+        box = self.history.undo()
+        if box is not None:
+            # every history step is one stroke, and the history only drops its oldest steps
+            self.redo_strokes.append(self.strokes.pop())
+            self.canvas.refresh_region(self.image, box)
+        self.update_history_buttons()
+
+    def redo(self):
+        if self.last_pos is not None:
+            return
+        box = self.history.redo()
+        if box is not None:
+            self.strokes.append(self.redo_strokes.pop())
+            self.canvas.refresh_region(self.image, box)
+        self.update_history_buttons()
+
+    def update_latency_label(self):
+        summary = self.canvas.latency.summary()
+        if summary is not None:
+            mean, p95, _ = summary
+            self.latency_label.setText(f"input latency {mean:.1f} ms (p95 {p95:.1f})")
+
+    def update_history_buttons(self):
+        self.undo_btn.setEnabled(self.history.can_undo())
+        self.redo_btn.setEnabled(self.history.can_redo())
+
+    def record_point(self, pos):
+        self.current_stroke.add_point(pos.x() / (self.canvas_width - 1), pos.y() / (self.canvas_height - 1))
 
     def draw_point(self, pos):
+        self.history.touch(segment_bbox(pos, pos, self.brush_size))
         if self.eraser_mode:
             self.draw.ellipse(
                 [pos.x() - self.brush_size, pos.y() - self.brush_size,
@@ -192,17 +1461,17 @@ class BigDrawingDialog(QDialog):
                 [pos.x() - self.brush_size, pos.y() - self.brush_size,
                  pos.x() + self.brush_size, pos.y() + self.brush_size],
                 fill=self.brush_color)
-        self.update_pixmap()
+        self.canvas.refresh_region(self.image, segment_bbox(pos, pos, self.brush_size))
 
-    def draw_line(self, start, end):
-        if self.eraser_mode:
-            self.draw.line([start.x(), start.y(), end.x(), end.y()], fill=(255, 255, 255, 255), width=self.brush_size * 2)
-        else:
-            self.draw.line([start.x(), start.y(), end.x(), end.y()], fill=self.brush_color, width=self.brush_size * 2)
-        self.update_pixmap()
+    def draw_polyline(self, points):
+        box = polyline_bbox(points, self.brush_size)
+        self.history.touch(box)
+        fill = (255, 255, 255, 255) if self.eraser_mode else self.brush_color
+        self.draw.line([(p.x(), p.y()) for p in points], fill=fill, width=self.brush_size * 2, joint="curve")
+        self.canvas.refresh_region(self.image, box)
 
-    def get_image(self):
-        return self.image.copy()
+    def get_drawing(self):
+        return StrokeDrawing((self.canvas_width, self.canvas_height), self.base, list(self.strokes))
 
 class DurationWidget(QWidget):
     def __init__(self, fps=DEFAULT_FPS, parent=None):
@@ -242,36 +1511,282 @@ class DurationWidget(QWidget):
             f = 0
         return s, f
 
-class StoryboardTable(QTableWidget):
-    def __init__(self, page_number=1, fps=DEFAULT_FPS, start_number=1, parent=None):
-        super().__init__(ROWS_PER_PAGE, COLS, parent)
-        self.page_number = page_number
-        self.fps = fps
-        self.start_number = start_number
-        self.duration_widgets = []
-        self.uploaded_images = [None] * ROWS_PER_PAGE
-        self.draw_widgets = [None] * ROWS_PER_PAGE  # Store drawing widgets if in draw mode
-        self.mode = "upload"  # def
+CUT_ROLE = Qt.UserRole + 1  # PageModel.data() hands the Cut itself to the delegates
+
+
+class PageModel(QAbstractTableModel):
+    # Qt face of one page of a Project: rows are cuts, nothing is copied out of the project
+    HEADERS = ["#", "Storyboard", "Description", "Duration"]
+
+    def __init__(self, project, page_index=0, parent=None):
+        super().__init__(parent)
+        self.project = project
+        self.page_index = page_index
+
+    @property
+    def page(self):
+        return self.project.pages[self.page_index]
+
+    @property
+    def fps(self):
+        return self.project.fps
+
+    def set_page(self, project, page_index):
+        self.beginResetModel()
+        self.project = project
+        self.page_index = page_index
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.page.cuts)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else COLS
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if index.column() in (2, 3):
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        cut = self.page.cuts[index.row()]
+        col = index.column()
+        if role == CUT_ROLE:
+            return cut
+        if role == Qt.TextAlignmentRole and col in (0, 3):
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole and col in (0, 3):
+            s, f = divmod(self.project.cut_start(self.page_index, index.row()), self.fps)
+            return f"Starts at {s} s + {f} f"
+        if col == 0 and role == Qt.DisplayRole:
+            return str(self.page.start_number + index.row())
+        if col == 2 and role in (Qt.DisplayRole, Qt.EditRole):
+            return cut.description
+        if col == 3:
+            if role == Qt.DisplayRole:
+                s, f = divmod(cut.frames, self.fps)
+                return f"( {s} + {f} )"
+            if role == Qt.EditRole:
+                return cut.frames
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        cut = self.page.cuts[index.row()]
+        if index.column() == 2:
+            cut.set_description(str(value).strip())
+        elif index.column() == 3:
+            self.project.set_frames(self.page_index, index.row(), max(0, int(value)))
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def refresh_images(self, first=0, last=None):
+        last = self.rowCount() - 1 if last is None else last
+        if last >= first:
+            self.dataChanged.emit(self.index(first, 1), self.index(last, 1))
+
+    def refresh_image_key(self, image_key):
+        for row, cut in enumerate(self.page.cuts):
+            if cut.image_key == image_key:
+                self.refresh_images(row, row)
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    # paints the storyboard column straight from the cuts; only rows that are on screen ever get decoded
+    # and thumbnailed, and the thumbnails come out of thumbnail_cache after the first paint. images that
+    # aren't decoded yet are handed to an ImageLoader and the cell shows a placeholder until they arrive
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loader = ImageLoader(parent=self)
+        self.loader.loaded.connect(self.on_image_loaded)
+
+    def on_image_loaded(self, image_key):
+        self.parent().model().refresh_image_key(image_key)
+
+    def paint(self, painter, option, index):
+        cut = index.data(CUT_ROLE)
+        rect = option.rect
+        width, height = max(1, rect.width()), max(1, rect.height())
+        painter.save()
+        if index.model().page.mode == "draw":
+            painter.fillRect(rect, Qt.white)
+            pixmap = self.draw_thumbnail(cut, width, height) if cut.has_image() else None
+            if pixmap is not None:
+                painter.drawPixmap(rect.topLeft(), pixmap)
+        elif cut.has_image():
+            pixmap = self.thumbnail_pixmap(cut, width, height)
+            if pixmap is not None:
+                painter.drawPixmap(rect.x() + (rect.width() - pixmap.width()) // 2,
+                                   rect.y() + (rect.height() - pixmap.height()) // 2, pixmap)
+            elif cut.image_key in self.loader.failed:
+                painter.drawText(rect, Qt.AlignCenter, "Unreadable Image")
+            else:
+                painter.drawText(rect, Qt.AlignCenter, "Loading...")
+        else:
+            painter.drawText(rect, Qt.AlignCenter, "Upload Image")
+        painter.restore()
+
+    def source_image(self, cut):
+        # what to thumbnail, or None while the decode is still running in the loader
+        if cut.drawing is not None:
+            return cut.drawing
+        image = image_store.peek(cut.stored)
+        if image is None:
+            self.loader.request(cut.stored)
+        return image
+
+    def thumbnail_pixmap(self, cut, width, height):
+        # cache hits skip both the decode and the resample
+        key = (cut.image_key, width, height, "fit")
+        pixmap = thumbnail_cache.get(key)
+        if pixmap is None:
+            image = self.source_image(cut)
+            if image is None:
+                return None
+            pixmap = self.pil_to_qpixmap_scaled(image, width, height)
+            thumbnail_cache.put(key, pixmap, pixmap.width() * pixmap.height() * 4)
+        return pixmap
+
+    def draw_thumbnail(self, cut, width, height):
+        key = (cut.image_key, width, height, "fill")
+        pixmap = thumbnail_cache.get(key)
+        if pixmap is None:
+            image = self.source_image(cut)
+            if image is None:
+                return None
+            pixmap = pil_to_qpixmap(scale_image(image, width, height))
+            thumbnail_cache.put(key, pixmap, width * height * 4)
+        return pixmap
+
+    def pil_to_qpixmap_scaled(self, pil_img, width, height):
+        img_ratio = pil_img.width / pil_img.height
+        target_ratio = width / height
+
+        if img_ratio > target_ratio:
+            new_width = width
+            new_height = int(width / img_ratio)
+        else:
+            new_height = height
+            new_width = int(height * img_ratio)
+
+        resized_img = scale_image(pil_img, new_width, new_height)
+        return pil_to_qpixmap(resized_img)
+
+
+class DurationDelegate(QStyledItemDelegate):
+    # durations are painted as text; a DurationWidget only exists while its cell is being edited
+
+    def createEditor(self, parent, option, index):
+        editor = DurationWidget(fps=index.model().fps, parent=parent)
+        editor.setAutoFillBackground(True)
+        editor.setFocusProxy(editor.seconds_edit)
+        editor.on_value_changed(lambda: self.commitData.emit(editor))  # totals follow every keystroke
+        return editor
+
+    def setEditorData(self, editor, index):
+        frames = index.data(Qt.EditRole)
+        s, f = editor.get_duration()
+        if s * editor.fps + f == frames:
+            return  # our own commit coming back, don't normalise what's being typed
+        s, f = divmod(frames, editor.fps)
+        # filling the editor isn't an edit, keep it from committing straight back
+        for edit, value in ((editor.seconds_edit, s), (editor.frames_edit, f)):
+            edit.blockSignals(True)
+            edit.setText(str(value))
+            edit.blockSignals(False)
+
+    def setModelData(self, editor, model, index):
+        s, f = editor.get_duration()
+        model.setData(index, s * editor.fps + f)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+
+class StoryboardTable(QTableView):
+    # view of one Page through a PageModel. there are no per-row widgets: cells are painted by delegates
+    # and only the cell being edited gets an editor, so a page costs the same whatever its length
+    def __init__(self, project, page_index=0, parent=None):
+        super().__init__(parent)
+        self.page_model = PageModel(project, page_index, self)
+        self.setModel(self.page_model)
+        self.setItemDelegateForColumn(1, ThumbnailDelegate(self))
+        self.setItemDelegateForColumn(3, DurationDelegate(self))
+        self.setAcceptDrops(True)
+        self.setDragDropMode(QAbstractItemView.DropOnly)
+        self.brush_color = (0, 0, 0, 255)  # drawing dialog settings, remembered between cuts
+        self.brush_size = 5
+        self.eraser_mode = False
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)  # only pages longer than ROWS_PER_PAGE scroll
         self.setEditTriggers(QAbstractItemView.AllEditTriggers)
-        self.setHorizontalHeaderLabels(["#", "Storyboard", "Description", "Duration"])
+        self.setWordWrap(True)
         self.verticalHeader().setVisible(False)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setMinimumSectionSize(1)
+
+        self.page_model.dataChanged.connect(self.on_data_changed)
+        self.page_model.modelReset.connect(self.notify_parent_to_update_total)
+        self.clicked.connect(self.on_cell_clicked)
+
+    @property
+    def project(self):
+        return self.page_model.project
+
+    @property
+    def page_index(self):
+        return self.page_model.page_index
+
+    @property
+    def page_number(self):
+        return self.page_index + 1
+
+    @property
+    def page(self):
+        return self.page_model.page
+
+    @property
+    def fps(self):
+        return self.page_model.fps
+
+    @property
+    def mode(self):
+        return self.page.mode
+
+    @property
+    def start_number(self):
+        return self.page.start_number
+
+    def cut(self, row):
+        return self.page.cuts[row]
+
+    def bind(self, project, page_index):
+        if project is not self.project or page_index != self.page_index:
+            self.page_model.set_page(project, page_index)
+
+    def refresh_cell(self, row):
+        self.page_model.refresh_images(row, row)
+
+    def refresh_cells(self):
+        self.page_model.refresh_images()
+
+    def on_data_changed(self, top_left, bottom_right, roles=()):
+        if top_left.column() <= 3 <= bottom_right.column():
+            self.notify_parent_to_update_total()
 
-        for row in range(ROWS_PER_PAGE):
-            self.setItem(row, 0, self.create_number_item(self.start_number + row))
-            self._add_upload_button(row)
-            self._add_description_placeholder(row)
-            self._add_duration_widget(row)
-
-    def create_number_item(self, num):
-        item = QTableWidgetItem(str(num))
-        item.setFlags(Qt.ItemIsEnabled)
-        item.setTextAlignment(Qt.AlignCenter)
-        return item
-    
     def update_geometry(self):
         total_width = self.viewport().width() or 800  # fallback if zero
         total_height = self.viewport().height() or 600
@@ -282,9 +1797,9 @@ class StoryboardTable(QTableWidget):
         total_width = max(0, total_width - margin_width)
         total_height = max(0, total_height - margin_height)
 
-        row_height = total_height // ROWS_PER_PAGE
-        for row in range(ROWS_PER_PAGE):
-            self.setRowHeight(row, row_height)
+        # one default size for every row instead of a call per row
+        row_height = max(1, total_height // ROWS_PER_PAGE)
+        self.verticalHeader().setDefaultSectionSize(row_height)
 
         col1_width = int(total_width * 0.07)
         storyboard_width = int((16 / 9) * row_height)
@@ -301,47 +1816,6 @@ class StoryboardTable(QTableWidget):
         self.setColumnWidth(2, col3_width)
         self.setColumnWidth(3, col4_width)
 
-        # Resize drawing widgets if any
-        for dw in self.draw_widgets:
-            if dw:
-                dw.setFixedSize(storyboard_width, row_height)
-
-    def create_fixed_size_button(self, text=None, pixmap=None, row=None):
-        btn = QPushButton()
-        btn.setProperty("row", row)
-        btn.setFlat(True)
-        btn.setCheckable(False)  # 🔹 Make sure it's not a toggle button
-        btn.setDown(False)     
-        btn.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        if pixmap:
-            btn.setIcon(pixmap)
-            btn.setIconSize(pixmap.size())
-            btn.setText("")
-        else:
-            btn.setText("Upload Image")
-        btn.clicked.connect(self.handle_upload_clicked)
-        return btn
-
-    def _add_upload_button(self, row):
-        btn = self.create_fixed_size_button(text="Upload Image", row=row)
-        cell_width = 150
-        cell_height =  85
-        btn.setFixedSize(cell_width, cell_height)
-        self.setCellWidget(row, 1, btn)
-
-    def _add_description_placeholder(self, row):
-        item = QTableWidgetItem(" ")
-        self.setItem(row, 2, item)
-
-    def _add_duration_widget(self, row):
-        dur_widget = DurationWidget(fps=self.fps)
-        dur_widget.on_value_changed(self.notify_parent_to_update_total)
-        cell_width = self.columnWidth(3) or 80
-        cell_height = self.rowHeight(row) or 50
-        dur_widget.setFixedSize(cell_width, cell_height)
-        self.setCellWidget(row, 3, dur_widget)
-        self.duration_widgets.append(dur_widget)
-
     def notify_parent_to_update_total(self):
         parent = self.parent()
         while parent:
@@ -350,457 +1824,1303 @@ class StoryboardTable(QTableWidget):
                 break
             parent = parent.parent()
 
-    def update_page_total_duration(self):
-        total_seconds = 0
-        total_frames = 0
-        for dur_widget in self.duration_widgets:
-            s, f = dur_widget.get_duration()
-            total_seconds += s
-            total_frames += f
-
-        extra_seconds = total_frames // self.fps
-        total_seconds += extra_seconds
-        total_frames = total_frames % self.fps
-        return total_seconds, total_frames
-
-    def handle_upload_clicked(self):
-        button = self.sender()
-        if button:
-            button.setDown(False)  # 🔹 reset visual press
-
-        if not button:
-            return
-        row = button.property("row")
-        if row is None:
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dragMoveEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        # dropped files and folders fill the cuts from the row they were dropped on
+        paths = dropped_paths(event.mimeData())
+        if not paths:
             return
+        event.acceptProposedAction()
+        row = max(0, self.indexAt(event.position().toPoint()).row())
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, "import_images"):
+                parent.import_images(paths, self.page_index, row)
+                break
+            parent = parent.parent()
+
+    def update_page_total_duration(self):
+        return divmod(self.project.page_total_frames(self.page_index), self.fps)
 
-        if self.mode != "upload":
-            # in draw mode, do nothing on upload button clicks
+    def on_cell_clicked(self, index):
+        if index.column() != 1:
             return
+        if self.mode == "draw":
+            self.edit_drawing(index.row())
+        else:
+            self.upload_image(index.row())
 
+    def upload_image(self, row):
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select Storyboard Image",
             "",
-            "Images (*.png *.jpg *.jpeg *.bmp *.gif)"
+            "Images (*.png *.jpg *.jpeg *.bmp *.gif *.tif *.tiff)"
         )
         if not file_path:
             return
 
-        pil_img = Image.open(file_path).convert("RGBA")
-        self.uploaded_images[row] = pil_img
+        # only the file's bytes are read (and their header checked) here; the cell's delegate decodes a
+        # working-size copy in the background and the full-resolution decode waits until an export asks
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            verify_image_data(data)
+        except Exception:
+            QMessageBox.warning(self, "Upload Image", f"Could not read {os.path.basename(file_path)}.")
+            return
+        self.cut(row).set_image(None, encoded=data)
+        self.refresh_cell(row)
+
+    def edit_drawing(self, row):
+        # drawn panels carry on from their strokes, anything else becomes the picture under the new strokes
+        cut = self.cut(row)
+        dlg = BigDrawingDialog(
+            pil_image=None if cut.stored is None else resolve_cut_image(cut.stored),
+            brush_color=self.brush_color,
+            brush_size=self.brush_size,
+            eraser_mode=self.eraser_mode,
+            drawing=cut.drawing,
+            parent=self
+        )
+        if dlg.exec() == QDialog.Accepted:
+            self.brush_color = dlg.brush_color
+            self.brush_size = dlg.brush_size
+            self.eraser_mode = dlg.eraser_mode
+
+            # Store the strokes, playback/export replay them at their own resolution. get_drawing() is a
+            # new object, so other cuts sharing the old drawing or image keep theirs
+            cut.set_drawing(dlg.get_drawing())
+            self.refresh_cell(row)
 
-        cell_width = self.columnWidth(1) or 150
-        cell_height = self.rowHeight(row) or 50
-        qt_pixmap = self.pil_to_qpixmap_scaled(pil_img, cell_width, cell_height)
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_geometry()
 
-        img_btn = self.create_fixed_size_button(pixmap=qt_pixmap, row=row)
-        img_btn.setFixedSize(cell_width, cell_height)
-        img_btn.setToolTip(file_path)
-        self.setCellWidget(row, 1, img_btn)
+@functools.lru_cache(maxsize=32)
+def load_font(size):
+    # truetype loading reads the font file every time, so keep one object per size
+    try:
+        return ImageFont.truetype("arial.ttf", size)
+    except IOError:
+        return ImageFont.load_default(size)
 
-        # Clear draw widget if any
-        if self.draw_widgets[row]:
-            self.draw_widgets[row].deleteLater()
-            self.draw_widgets[row] = None
 
-    def pil_to_qpixmap_scaled(self, pil_img, width, height):
-        img_ratio = pil_img.width / pil_img.height
-        target_ratio = width / height
+def render_playback_frame(pil_image, number, description, target_w, target_h):
+    # letterboxed frame with the cut number and caption baked in, one LANCZOS pass straight to the final size
+    bg = SharedImage(target_w, target_h, (0, 0, 0, 255)).image
+    target_ratio = 16 / 9
 
+    if pil_image:
+        img_ratio = pil_image.width / pil_image.height
         if img_ratio > target_ratio:
-            new_width = width
-            new_height = int(width / img_ratio)
+            new_w = target_w
+            new_h = int(target_w / img_ratio)
         else:
-            new_height = height
-            new_width = int(height * img_ratio)
+            new_h = target_h
+            new_w = int(target_h * img_ratio)
+
+        resized_img = scale_image(pil_image, new_w, new_h)
+        x_offset = (target_w - new_w) // 2
+        y_offset = (target_h - new_h) // 2
+        bg.paste(resized_img, (x_offset, y_offset))
+
+    # Draw storyboard number on top-left
+    draw = ImageDraw.Draw(bg)
+    font_size = max(10, target_h // 20)
+    font = load_font(font_size)
+
+    text = f"Cut no. {number}"
+    margin = 10
+    text_pos = (margin, margin)
+    shadow_color = (0, 0, 0, 255)
+    text_color = (255, 255, 255, 255)
+
+    for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+        pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
+        draw.text(pos, text, font=font, fill=shadow_color)
+
+    draw.text(text_pos, text, font=font, fill=text_color)
+
+    # Draw description bottom-right, it doesn't change during the cut so it lives in the frame
+    if description:
+        desc_font = load_font(max(18, target_h // 30))
+        desc_margin = 15
+        # Get bounding box: (left, top, right, bottom)
+        bbox = desc_font.getbbox(description)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        desc_pos = (target_w - desc_margin - text_width, target_h - desc_margin - text_height)
+
+        # Draw shadow for readability
+        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+            pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
+            draw.text(pos, description, font=desc_font, fill=shadow_color)
 
-        resized_img = pil_img.resize((new_width, new_height), Image.LANCZOS)
-        data = resized_img.tobytes("raw", "RGBA")
-        qimg = QImage(data, resized_img.width, resized_img.height, QImage.Format_RGBA8888)
-        return QPixmap.fromImage(qimg)
-
-    def switch_to_draw_mode(self):
-        self.mode = "draw"
-        # Replace storyboard column widgets with DrawingWidgets or blank if none
-        for row in range(ROWS_PER_PAGE):
-            if self.draw_widgets[row] is None:
-                dw = DrawingWidget(self.columnWidth(1), self.rowHeight(row))
-                self.draw_widgets[row] = dw
-            else:
-                dw = self.draw_widgets[row]
-                dw.setFixedSize(self.columnWidth(1), self.rowHeight(row))
-            self.setCellWidget(row, 1, self.draw_widgets[row])
-            self.uploaded_images[row] = None  # Clear uploaded images in draw mode
-
-    def switch_to_upload_mode(self):
-        self.mode = "upload"
-        # Replace storyboard column widgets with upload buttons or uploaded image buttons
-        for row in range(ROWS_PER_PAGE):
-            if self.draw_widgets[row]:
-                self.draw_widgets[row].deleteLater()
-                self.draw_widgets[row] = None
-            if self.uploaded_images[row]:
-                pil_img = self.uploaded_images[row]
-                cell_width = self.columnWidth(1) or 150
-                cell_height = self.rowHeight(row) or 50
-                qt_pixmap = self.pil_to_qpixmap_scaled(pil_img, cell_width, cell_height)
-                img_btn = self.create_fixed_size_button(pixmap=qt_pixmap, row=row)
-                img_btn.setFixedSize(cell_width, cell_height)
-                self.setCellWidget(row, 1, img_btn)
-            else:
-                self._add_upload_button(row)
+        draw.text(desc_pos, description, font=desc_font, fill=text_color)
 
-    def mousePressEvent(self, event):
-        if self.mode != "draw":
-            super().mousePressEvent(event)
-            return
+    return bg
 
-        pos = event.position().toPoint() if hasattr(event, 'position') else event.pos()
-        index = self.indexAt(pos)
-        if not index.isValid():
-            super().mousePressEvent(event)
-            return
 
-        row = index.row()
-        col = index.column()
-        if col == 1 and 0 <= row < ROWS_PER_PAGE:
-            # Load full-res image from uploaded_images, fallback to blank canvas
-            current_img = self.uploaded_images[row]
-            if current_img is None:
-                current_img = Image.new("RGBA", (800, 450), (255, 255, 255, 255))
-
-            dlg = BigDrawingDialog(
-                pil_image=current_img,
-                brush_color=self.draw_widgets[row].brush_color if self.draw_widgets[row] else (0, 0, 0, 255),
-                brush_size=self.draw_widgets[row].brush_size if self.draw_widgets[row] else 5,
-                eraser_mode=self.draw_widgets[row].eraser_mode if self.draw_widgets[row] else False,
-                parent=self
-            )
-            if dlg.exec() == QDialog.Accepted:
-                new_img = dlg.get_image()
-
-                # Store full-res image for playback/export
-                self.uploaded_images[row] = new_img
-
-                # Create thumbnail sized to cell
-                thumb_width = self.columnWidth(1)
-                thumb_height = self.rowHeight(row)
-                thumbnail_img = new_img.resize((thumb_width, thumb_height), Image.LANCZOS)
-
-                # Update or create the draw widget thumbnail
-                if self.draw_widgets[row]:
-                    self.draw_widgets[row].image = thumbnail_img
-                    self.draw_widgets[row].draw = ImageDraw.Draw(self.draw_widgets[row].image)
-                    self.draw_widgets[row].update_pixmap()
-                else:
-                    dw = DrawingWidget(thumb_width, thumb_height)
-                    dw.image = thumbnail_img
-                    dw.draw = ImageDraw.Draw(dw.image)
-                    dw.update_pixmap()
-                    self.draw_widgets[row] = dw
-                    self.setCellWidget(row, 1, dw)
-
-                # Update draw widget image resized to widget size for thumbnail
-                if self.draw_widgets[row]:
-                    self.draw_widgets[row].image = new_img.resize(
-                        (self.draw_widgets[row].width(), self.draw_widgets[row].height()),
-                        Image.LANCZOS
-                    )
-                    self.draw_widgets[row].draw = ImageDraw.Draw(self.draw_widgets[row].image)
-                    self.draw_widgets[row].update_pixmap()
-                    # Store full res big image in uploaded_images for player
-                    self.uploaded_images[row] = new_img
-                else:
-                    # Justincase
-                    dw = DrawingWidget(self.columnWidth(1), self.rowHeight(row))
-                    dw.image = new_img.resize(
-                        (dw.width(), dw.height()), Image.LANCZOS)
-                    dw.draw = ImageDraw.Draw(dw.image)
-                    dw.update_pixmap()
-                    self.draw_widgets[row] = dw
-                    self.setCellWidget(row, 1, dw)
-                    self.uploaded_images[row] = new_img
-        else:
-            super().mousePressEvent(event)
+class PlaybackView(QWidget):
+    # shows the current frame as one persistent pixmap and paints the timecode over it with QPainter,
+    # so a timecode tick only repaints the small box around the text
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)  # let the window shrink below the last frame
+        self.frame_pixmap = None
+        self.timecode = ""
+        self.timecode_rect = QRect()
+        self.timecode_font = QFont()
+
+    def set_frame(self, pil_img):
+        self.frame_pixmap = pil_to_qpixmap(pil_img)
+        self.timecode_rect = self.layout_timecode()
+        self.update()
+
+    def set_timecode(self, text):
+        if text == self.timecode:
+            return
+        old_rect = self.timecode_rect
+        self.timecode = text
+        self.timecode_rect = self.layout_timecode()
+        self.update(old_rect.united(self.timecode_rect))
+
+    def layout_timecode(self):
+        font_size = max(24, self.height() // 20)
+        if self.timecode_font.pixelSize() != font_size:
+            self.timecode_font = QFont()
+            self.timecode_font.setPixelSize(font_size)
+        metrics = QFontMetrics(self.timecode_font)
+        margin = self.height() // 30
+        x = margin
+        y = self.height() - margin - font_size
+        # padded for the 2px shadow
+        return QRect(x - 3, y - 3, metrics.horizontalAdvance(self.timecode) + 6, metrics.height() + 6)
 
     def resizeEvent(self, event):
-        total_width = self.viewport().width()
-        total_height = self.viewport().height()
+        self.timecode_rect = self.layout_timecode()
+        super().resizeEvent(event)
 
-        margin_width = 20
-        margin_height = 40
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), Qt.black)
+        if self.frame_pixmap is not None:
+            x = (self.width() - self.frame_pixmap.width()) // 2
+            y = (self.height() - self.frame_pixmap.height()) // 2
+            painter.drawPixmap(x, y, self.frame_pixmap)
+
+        if self.timecode:
+            painter.setFont(self.timecode_font)
+            ascent = QFontMetrics(self.timecode_font).ascent()
+            x = self.timecode_rect.x() + 3
+            y = self.timecode_rect.y() + 3 + ascent
+            painter.setPen(Qt.black)
+            for offset in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
+                painter.drawText(x + offset[0], y + offset[1], self.timecode)
+            painter.setPen(Qt.white)
+            painter.drawText(x, y, self.timecode)
+        painter.end()
 
-        total_width = max(0, total_width - margin_width)
-        total_height = max(0, total_height - margin_height)
 
-        row_height = total_height // ROWS_PER_PAGE
-        for row in range(ROWS_PER_PAGE):
-            self.setRowHeight(row, row_height)
+class FramePrefetcher:
+    # renders the next few cuts on worker threads (PIL drops the GIL while resampling) into a small ring
+    # of ready frames; everything in the ring is for one output size and gets dropped when it changes
+
+    def __init__(self, render, count, depth=PLAYBACK_PREFETCH, workers=2):
+        self.render = render  # render(index, width, height) -> frame
+        self.count = count
+        self.depth = depth
+        self.size = None
+        self.ring = OrderedDict()  # index -> Future
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def set_size(self, width, height):
+        if (width, height) != self.size:
+            self.invalidate()
+            self.size = (width, height)
+
+    def invalidate(self):
+        for future in self.ring.values():
+            future.cancel()
+        self.ring.clear()
+
+    def prefetch(self, index):
+        # the cut before stays in the ring too, so stepping back after a seek is free
+        wanted = range(max(0, index - 1), min(index + self.depth + 1, self.count))
+        for old in list(self.ring):
+            if old not in wanted:
+                self.ring.pop(old).cancel()
+        for i in wanted:
+            if i not in self.ring:
+                self.ring[i] = self.executor.submit(self.render, i, *self.size)
+
+    def get(self, index):
+        future = self.ring.get(index)
+        if future is None or future.cancelled():
+            return self.render(index, *self.size)
+        return future.result()
+
+    def shutdown(self):
+        self.invalidate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_timecode(text, fps=DEFAULT_FPS):
+    # "12", "12+3", "12 s + 3 f", "1:05+3" (min:sec) -> frames; None if it doesn't parse
+    match = re.fullmatch(r"\s*(?:(\d+)\s*:)?\s*(\d+)\s*s?\s*(?:\+\s*(\d+)\s*f?)?\s*", text)
+    if not match:
+        return None
+    minutes, seconds, frames = (int(group or 0) for group in match.groups())
+    return (minutes * 60 + seconds) * fps + frames
+
+
+class PlaybackClock:
+    # works out the playhead from a monotonic clock instead of counting timer ticks, so late ticks show up
+    # as dropped frames rather than drift; cut lengths are whole frames and the total plays in exactly
+    # total_frames / fps seconds
+
+    def __init__(self, cut_frames, fps=DEFAULT_FPS, now=time.monotonic_ns):
+        self.fps = fps
+        self.now = now
+        self.timeline = TimelineIndex(cut_frames)
+        self.total_frames = self.timeline.total
+        self.start_ns = None
+        self.last_frame = -1
+        self.dropped_frames = 0
 
-        col1_width = int(total_width * 0.07)
-        storyboard_width = int((16 / 9) * row_height)
+    def start(self, from_frame=0):
+        self.start_ns = self.now() - from_frame * 1_000_000_000 // self.fps
+        self.last_frame = from_frame - 1
 
-        if storyboard_width > total_width - col1_width:
-            storyboard_width = total_width - col1_width
+    def tick(self):
+        elapsed_ns = self.now() - self.start_ns
+        frame = min(elapsed_ns * self.fps // 1_000_000_000, self.total_frames)
+        if frame > self.last_frame + 1:
+            self.dropped_frames += frame - self.last_frame - 1
+        self.last_frame = max(self.last_frame, frame)
+        return frame
 
-        rest_width = total_width - (col1_width + storyboard_width)
-        col3_width = int(rest_width * 0.7)
-        col4_width = rest_width - col3_width
-
-        self.setColumnWidth(0, col1_width)
-        self.setColumnWidth(1, storyboard_width)
-        self.setColumnWidth(2, col3_width)
-        self.setColumnWidth(3, col4_width)
+    def locate(self, frame):
+        # (cut index, frame within the cut); zero-length cuts are never returned
+        return self.timeline.find(frame)
 
-        # Resize drawing widgets if any
-        for dw in self.draw_widgets:
-            if dw:
-                dw.setFixedSize(storyboard_width, row_height)
+    def finished(self, frame):
+        return frame >= self.total_frames
 
-        super().resizeEvent(event)
 
 class PlayerWindow(QDialog):
-    def __init__(self, frames, durations, numbers, descriptions, fps=DEFAULT_FPS, parent=None):
+    def __init__(self, frames, cut_frames, numbers, descriptions, fps=DEFAULT_FPS, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Storyboard Playback")
         self.fps = fps
-        self.frames = frames
+        self.frames = frames  # image sources, resolved on demand (see resolve_cut_image)
         self.numbers = numbers
-        self.durations = durations
+        self.cut_frames = cut_frames
         self.descriptions = descriptions
         self.current_index = 0
-        self.elapsed_ms = 0
+        self.cut_frame = 0  # frames into the current cut
+        self.position = 0  # frames into the whole animatic
+        self.current_image = None
+        self.playing = False
+        self.loop_in = 0
+        self.loop_out = None  # exclusive; None means the end
+        self.pending_seek = None
+        self.prefetcher = FramePrefetcher(self.render_frame, len(frames))
+        self.clock = PlaybackClock(cut_frames, fps=fps)
+        self.number_index = {number: i for i, number in reversed(list(enumerate(numbers)))}
 
-        self.resize(960, 540)
+        self.resize(960, 600)
 
-        self.label = QLabel()
-        self.label.setAlignment(Qt.AlignCenter)
+        self.view = PlaybackView()
         layout = QVBoxLayout(self)
-        layout.addWidget(self.label)
-
+        layout.addWidget(self.view, 1)
+
+        self.scrub_slider = QSlider(Qt.Horizontal)
+        self.scrub_slider.setRange(0, max(0, self.clock.total_frames - 1))
+        self.scrub_slider.setPageStep(fps)
+        self.scrub_slider.valueChanged.connect(self.on_scrub)
+        layout.addWidget(self.scrub_slider)
+
+        controls = QHBoxLayout()
+        layout.addLayout(controls)
+
+        self.play_btn = QPushButton("Pause")
+        self.play_btn.clicked.connect(self.toggle_playback)
+        controls.addWidget(self.play_btn)
+
+        prev_btn = QPushButton("<")
+        prev_btn.clicked.connect(lambda: self.step_cut(-1))
+        controls.addWidget(prev_btn)
+        next_btn = QPushButton(">")
+        next_btn.clicked.connect(lambda: self.step_cut(1))
+        controls.addWidget(next_btn)
+
+        self.position_label = QLabel()
+        controls.addWidget(self.position_label)
+        controls.addStretch()
+
+        controls.addWidget(QLabel("Cut"))
+        self.cut_spin = QSpinBox()
+        self.cut_spin.setRange(min(numbers, default=0), max(numbers, default=0))
+        self.cut_spin.setKeyboardTracking(False)  # jump on enter/arrows, not on every digit
+        self.cut_spin.valueChanged.connect(self.jump_to_cut_number)
+        controls.addWidget(self.cut_spin)
+
+        controls.addWidget(QLabel("Go to"))
+        self.timecode_edit = QLineEdit()
+        self.timecode_edit.setPlaceholderText("s + f")
+        self.timecode_edit.setFixedWidth(80)
+        self.timecode_edit.returnPressed.connect(self.jump_to_timecode)
+        controls.addWidget(self.timecode_edit)
+
+        in_btn = QPushButton("In")
+        in_btn.clicked.connect(self.set_loop_in)
+        controls.addWidget(in_btn)
+        out_btn = QPushButton("Out")
+        out_btn.clicked.connect(self.set_loop_out)
+        controls.addWidget(out_btn)
+        self.loop_checkbox = QCheckBox("Loop")
+        self.loop_checkbox.toggled.connect(self.update_position_label)
+        controls.addWidget(self.loop_checkbox)
+
+        for button in self.findChildren(QPushButton):
+            button.setAutoDefault(False)  # enter in the timecode box must not hit Play/Pause
+
+        # poll at twice the frame rate, the clock decides what's on screen
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.update_frame)
 
-        self.current_image = None
+        # scrubbing coalesces to the latest slider value, so a fast drag doesn't queue a render per step
+        self.seek_timer = QTimer()
+        self.seek_timer.setSingleShot(True)
+        self.seek_timer.timeout.connect(self.apply_pending_seek)
 
         self.start_playback()
 
     def start_playback(self):
-        self.current_index = 0
-        self.elapsed_ms = 0
-        self.show_frame(self.current_index)
-        self.timer.start(40)
+        self.show_position(0)
+        self.play()  # only once the first frame is up
+
+    def loop_end(self):
+        return self.clock.total_frames if self.loop_out is None else self.loop_out
+
+    def play(self):
+        if self.clock.finished(self.position + 1) or (self.loop_checkbox.isChecked() and self.position + 1 >= self.loop_end()):
+            self.show_position(self.loop_in if self.loop_checkbox.isChecked() else 0)
+        self.clock.start(self.position)
+        self.timer.start(max(1, 500 // self.fps))
+        self.playing = True
+        self.play_btn.setText("Pause")
+
+    def pause(self):
+        self.timer.stop()
+        self.playing = False
+        self.play_btn.setText("Play")
+
+    def toggle_playback(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
 
     def update_frame(self):
-        if self.current_index >= len(self.frames):
-            self.timer.stop()
+        frame = self.clock.tick()
+        if self.loop_checkbox.isChecked() and frame >= self.loop_end():
+            frame = self.loop_in
+            self.clock.start(frame)
+        elif self.clock.finished(frame):
+            self.show_position(self.clock.total_frames - 1)
+            self.pause()
+            self.report_dropped_frames()
             return
 
-        s, f = self.durations[self.current_index]
-        total_ms = int((s + f / self.fps) * 1000)
+        self.show_position(frame)
+        self.report_dropped_frames()
 
-        if total_ms <= 0:
-            self.current_index += 1
-            self.elapsed_ms = 0
-            if self.current_index < len(self.frames):
-                self.show_frame(self.current_index)
-            return
+    def show_position(self, frame):
+        self.position = frame
+        index, self.cut_frame = self.clock.locate(frame)
+        if index != self.current_index or self.current_image is None:
+            self.current_index = index
+            self.show_frame(index)
+        else:
+            self.update_timecode_display()
+        self.scrub_slider.blockSignals(True)
+        self.scrub_slider.setValue(frame)
+        self.scrub_slider.blockSignals(False)
+        self.cut_spin.blockSignals(True)
+        self.cut_spin.setValue(self.numbers[index])
+        self.cut_spin.blockSignals(False)
+        self.update_position_label()
+
+    def seek(self, frame):
+        frame = max(0, min(frame, self.clock.total_frames - 1))
+        self.show_position(frame)
+        if self.playing:
+            self.clock.start(frame)
+
+    def on_scrub(self, value):
+        self.pending_seek = value
+        self.seek_timer.start(0)
+
+    def apply_pending_seek(self):
+        if self.pending_seek is not None:
+            frame, self.pending_seek = self.pending_seek, None
+            self.seek(frame)
+
+    def jump_to_cut(self, index):
+        index = max(0, min(index, len(self.frames) - 1))
+        self.seek(self.clock.timeline.prefix(index))
+
+    def jump_to_cut_number(self, number):
+        index = self.number_index.get(number)
+        if index is None:
+            # numbers with no duration aren't in the animatic, go to the next one that is
+            index = bisect.bisect_left(self.numbers, number)
+        self.jump_to_cut(index)
+
+    def step_cut(self, step):
+        if step < 0 and self.cut_frame > 0:
+            self.jump_to_cut(self.current_index)  # back to the start of this cut first
+        else:
+            self.jump_to_cut(self.current_index + step)
+
+    def jump_to_timecode(self):
+        frame = parse_timecode(self.timecode_edit.text(), self.fps)
+        if frame is not None:
+            self.seek(frame)
+
+    def set_loop_in(self):
+        self.loop_in = self.position
+        if self.loop_out is not None and self.loop_out <= self.loop_in:
+            self.loop_out = None
+        self.update_position_label()
+
+    def set_loop_out(self):
+        self.loop_out = self.position + 1
+        if self.loop_in >= self.loop_out:
+            self.loop_in = 0
+        self.update_position_label()
+
+    def update_position_label(self):
+        s, f = divmod(self.position, self.fps)
+        total_s, total_f = divmod(self.clock.total_frames, self.fps)
+        text = f"{s}s + {f:02d}f / {total_s}s + {total_f:02d}f"
+        if self.loop_checkbox.isChecked():
+            in_s, in_f = divmod(self.loop_in, self.fps)
+            out_s, out_f = divmod(self.loop_end(), self.fps)
+            text += f"  loop {in_s}s + {in_f:02d}f - {out_s}s + {out_f:02d}f"
+        self.position_label.setText(text)
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        if key == Qt.Key_Space:
+            self.toggle_playback()
+        elif key == Qt.Key_Left:
+            self.step_cut(-1)
+        elif key == Qt.Key_Right:
+            self.step_cut(1)
+        elif key == Qt.Key_Comma:
+            self.seek(self.position - 1)
+        elif key == Qt.Key_Period:
+            self.seek(self.position + 1)
+        elif key == Qt.Key_Home:
+            self.seek(0)
+        else:
+            super().keyPressEvent(event)
 
-        self.elapsed_ms += 40
+    def report_dropped_frames(self):
+        if self.clock.dropped_frames:
+            self.setWindowTitle(f"Storyboard Playback ({self.clock.dropped_frames} dropped frames)")
 
-        if self.elapsed_ms >= total_ms:
-            self.current_index += 1
-            self.elapsed_ms = 0
-            if self.current_index < len(self.frames):
-                self.show_frame(self.current_index)
-            else:
-                self.timer.stop()
-                return
+    def render_frame(self, index, target_w, target_h):
+        # runs on the prefetch workers, must not touch widgets
+        return render_playback_frame(
+            resolve_cut_image(self.frames[index]), self.numbers[index], self.descriptions[index], target_w, target_h)
 
+    def show_frame(self, index):
+        self.prefetcher.set_size(max(1, self.view.width()), max(1, self.view.height()))
+        self.current_image = self.prefetcher.get(index)
+        self.prefetcher.prefetch(index)
+        self.view.set_frame(self.current_image)
         self.update_timecode_display()
 
-    def show_frame(self, index):
-        pil_image = self.frames[index]
-        target_w, target_h = self.width(), self.height()
-        target_ratio = 16 / 9
-        new_h = target_h
-        new_w = int(new_h * target_ratio)
-        if new_w > target_w:
-            new_w = target_w
-            new_h = int(new_w / target_ratio)
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # frames are rendered for the window size, anything already queued is stale now
+        if self.current_image is not None and self.current_index < len(self.frames):
+            self.show_frame(self.current_index)
 
-        img_resized = pil_image.resize((new_w, new_h), Image.LANCZOS).convert("RGBA")
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.seek_timer.stop()
+        self.prefetcher.shutdown()
+        super().closeEvent(event)
 
-        self.current_image = img_resized
-        self.elapsed_ms = 0
-        self.update_timecode_display(force=True)
+    def update_timecode_display(self):
+        if not self.current_image:
+            return
 
-        bg = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 255))
+        elapsed_sec, elapsed_frame = divmod(self.cut_frame, self.fps)
+        self.view.set_timecode(f"{elapsed_sec:02d}s + {elapsed_frame:02d}f")
 
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
-            else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
 
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
-        else:
-            # blank black frame
-            pass
+def resolve_cut_image(image_source):
+    # never raises: a cut without an image, or one whose image can't be read, comes out as a blank panel
+    try:
+        if isinstance(image_source, bytes):
+            return Image.open(io.BytesIO(image_source)).convert("RGBA")
+        if isinstance(image_source, StoredImage):
+            return image_store.get_image(image_source)
+    except Exception:
+        image_source = None
+    if image_source is None:
+        return Image.new("RGBA", (800, 450), (255, 255, 255, 255))
+    return image_source
 
-        # Draw storyboard number on top-left
-        draw = ImageDraw.Draw(bg)
-        font_size = max(10, target_h // 20)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
 
-        text = f"Cut no. {self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = (0, 0, 0, 255)
-        text_color = (255, 255, 255, 255)
+def render_export_frame(pil_image, number, description, target_w=EXPORT_SIZE[0], target_h=EXPORT_SIZE[1]):
+    target_ratio = 16 / 9
 
+    bg = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 255))
+
+    if pil_image:
+        img_ratio = pil_image.width / pil_image.height
+        if img_ratio > target_ratio:
+            new_w = target_w
+            new_h = int(target_w / img_ratio)
+        else:
+            new_h = target_h
+            new_w = int(target_h * img_ratio)
+        resized_img = scale_image(pil_image, new_w, new_h)
+        x_offset = (target_w - new_w) // 2
+        y_offset = (target_h - new_h) // 2
+        bg.paste(resized_img, (x_offset, y_offset))
+
+    draw = ImageDraw.Draw(bg)
+
+    # Storyboard number
+    font_size = max(24, target_h // 20)
+    font = load_font(font_size)
+
+    text = f"#{number}"
+    margin = 10
+    text_pos = (margin, margin)
+    shadow_color = (0, 0, 0, 255)
+    text_color = (255, 255, 255, 255)
+
+    for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+        pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
+        draw.text(pos, text, font=font, fill=shadow_color)
+    draw.text(text_pos, text, font=font, fill=text_color)
+
+    # Description bottom-right
+    if description:
+        desc_font_size = max(18, target_h // 30)
+        desc_font = load_font(desc_font_size)
+        desc_w, desc_h = draw.textbbox((0, 0), description, font=desc_font)[2:]
+        desc_pos = (target_w - desc_w - 15, target_h - desc_h - 15)
         for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
+            pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
+            draw.text(pos, description, font=desc_font, fill=shadow_color)
+        draw.text(desc_pos, description, font=desc_font, fill=text_color)
+
+    return bg
+
+
+def export_source(image_source):
+    # a cut's image source as the full-quality original, in a form that pickles: store handles become
+    # their encoded bytes (read back from disk if they were spilled), drawings go as they are
+    if isinstance(image_source, StoredImage):
+        return image_store.get_blob(image_source)
+    return image_source
+
+
+def render_export_job(image_source, number, description, size):
+    # process pool entry point: everything in and out has to pickle, so the frame comes back as raw RGB
+    frame = render_export_frame(resolve_cut_image(image_source), number, description, *size)
+    return frame.convert("RGB").tobytes()
+
+
+def iter_export_frames(cuts, size=EXPORT_SIZE, workers=None, window=None):
+    # yields (cut, HxWx3 uint8 array) in cut order while the rendering fans out over a process pool;
+    # at most `window` frames are queued or finished-but-unconsumed at any time. originals are fetched
+    # from the store as their cut is submitted, so only the cuts in the window hold encoded bytes
+    workers = workers or EXPORT_WORKERS
+    width, height = size
+
+    if workers <= 1:
+        for cut in cuts:
+            image_source, _, number, description = cut
+            data = render_export_job(export_source(image_source), number, description, size)
+            yield cut, np.frombuffer(data, np.uint8).reshape(height, width, 3)
+        return
+
+    window = window or workers * 2
+    # spawn rather than fork: forking a process that has Qt threads running is asking for trouble
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        cut_iter = iter(cuts)
+        pending = deque()
+
+        def submit(cut):
+            image_source, _, number, description = cut
+            pending.append(
+                (cut, pool.submit(render_export_job, export_source(image_source), number, description, size)))
+
+        for cut in itertools.islice(cut_iter, window):
+            submit(cut)
+        while pending:
+            cut, future = pending.popleft()
+            data = future.result()
+            next_cut = next(cut_iter, None)
+            if next_cut is not None:
+                submit(next_cut)
+            yield cut, np.frombuffer(data, np.uint8).reshape(height, width, 3)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def write_animatic(filename, cuts, fps=DEFAULT_FPS, size=EXPORT_SIZE, progress=None, is_cancelled=None, workers=None):
+    # streams the animatic to ffmpeg: each cut is rendered once (in parallel, see iter_export_frames) and
+    # that frame is written for its whole duration. returns False if cancelled (partial file removed)
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+
+    total_frames = sum(frames for _, frames, _, _ in cuts)
+    written = 0
+    writer = FFMPEG_VideoWriter(filename, size, fps, codec="libx264", preset="medium",
+                                ffmpeg_params=["-pix_fmt", "yuv420p"])
+    frames = iter_export_frames(cuts, size, workers=workers)
+    try:
+        for (_, cut_frames, _, _), frame_array in frames:
+            if is_cancelled and is_cancelled():
+                break
+            for _ in range(cut_frames):
+                if is_cancelled and is_cancelled():
+                    break
+                writer.write_frame(frame_array)
+                written += 1
+                if progress and (written % fps == 0 or written == total_frames):
+                    progress(written, total_frames)
+    except BaseException:
+        frames.close()
+        writer.close()
+        if os.path.exists(filename):
+            os.remove(filename)
+        raise
+    frames.close()
+    writer.close()
+
+    if written < total_frames:
+        if os.path.exists(filename):
+            os.remove(filename)
+        return False
+    return True
+
+
+class SpreadRenderer:
+    # draws storyboard spreads straight from project data with QPainter, laid out like the page tables
+    # (number, panel, description and duration columns, the page total underneath) without any widgets.
+    # the layout is in 1/96 inch units and the painter is scaled to the output's DPI; panels are decoded
+    # or replayed at the pixel size they are printed at, so the same layout stays sharp at any resolution.
+    # only the spread being drawn is in memory: images are saved and PDF pages emitted one at a time
+    SPREAD_SIZE = (1400, 900)
+    MARGIN = 36
+    GUTTER = 24
+    HEADER_HEIGHT = 40  # title, spread and page numbers
+    COLUMN_HEADER_HEIGHT = 24
+    FOOTER_HEIGHT = 28
+    HEADERS = PageModel.HEADERS
+
+    def __init__(self, project, dpi=SPREAD_DPI):
+        self.project = project
+        self.dpi = dpi
+
+    @property
+    def scale(self):
+        return self.dpi / 96
+
+    def spread_count(self):
+        return (len(self.project.pages) + 1) // 2
+
+    def render_image(self, spread_index):
+        width, height = (round(size * self.scale) for size in self.SPREAD_SIZE)
+        image = QImage(width, height, QImage.Format_RGB32)
+        image.setDotsPerMeterX(round(self.dpi / 0.0254))
+        image.setDotsPerMeterY(round(self.dpi / 0.0254))
+        image.fill(Qt.white)
+        painter = QPainter(image)
+        painter.scale(self.scale, self.scale)
+        self.paint_spread(painter, spread_index)
+        painter.end()
+        return image
+
+    def write_images(self, pattern, progress=None, is_cancelled=None):
+        # pattern: file name with a "{}" field for the 1-based spread number, e.g. "board_{:03d}.png".
+        # returns the files written, None if cancelled
+        count = self.spread_count()
+        files = []
+        for i in range(count):
+            if is_cancelled and is_cancelled():
+                return None
+            filename = pattern.format(i + 1)
+            if not self.render_image(i).save(filename):
+                raise OSError(f"could not write {filename}")
+            files.append(filename)
+            if progress:
+                progress(i + 1, count)
+        return files
+
+    def write_pdf(self, filename, progress=None, is_cancelled=None):
+        # one spread per page. returns False if cancelled (partial file removed)
+        writer = QPdfWriter(filename)
+        writer.setResolution(self.dpi)
+        writer.setTitle(self.project.title)
+        width, height = (size * 72 / 96 for size in self.SPREAD_SIZE)
+        writer.setPageSize(QPageSize(QSizeF(width, height), QPageSize.Point, "Spread"))
+        writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+        painter = QPainter(writer)
+        if not painter.isActive():
+            raise OSError(f"could not write {filename}")
+        painter.scale(self.scale, self.scale)
+        count = self.spread_count()
+        cancelled = False
+        for i in range(count):
+            if is_cancelled and is_cancelled():
+                cancelled = True
+                break
+            if i:
+                writer.newPage()
+            self.paint_spread(painter, i)
+            if progress:
+                progress(i + 1, count)
+        painter.end()
+        if cancelled and os.path.exists(filename):
+            os.remove(filename)
+        return not cancelled
+
+    def paint_spread(self, painter, spread_index):
+        width, height = self.SPREAD_SIZE
+        page_indices = range(spread_index * 2, min(spread_index * 2 + 2, len(self.project.pages)))
+        page_width = (width - 2 * self.MARGIN - self.GUTTER) / 2
+        top = self.MARGIN + self.HEADER_HEIGHT
+
+        painter.setPen(Qt.black)
+        painter.setFont(self.font(16, bold=True))
+        header = QRectF(self.MARGIN, self.MARGIN, width - 2 * self.MARGIN, self.HEADER_HEIGHT / 2)
+        painter.drawText(header, Qt.AlignLeft | Qt.AlignVCenter, self.project.title)
+        painter.setFont(self.font(11))
+        painter.drawText(header, Qt.AlignRight | Qt.AlignVCenter, f"Spread {spread_index + 1} / {self.spread_count()}")
+
+        for side, page_index in enumerate(page_indices):
+            x = self.MARGIN + side * (page_width + self.GUTTER)
+            painter.setFont(self.font(11))
+            label = QRectF(x, self.MARGIN + self.HEADER_HEIGHT / 2, page_width, self.HEADER_HEIGHT / 2)
+            painter.drawText(label, Qt.AlignLeft | Qt.AlignVCenter, f"Page {page_index + 1}")
+            self.paint_page(painter, page_index, QRectF(x, top, page_width, height - top - self.MARGIN))
+
+    def paint_page(self, painter, page_index, rect):
+        page = self.project.pages[page_index]
+        fps = self.project.fps
+        grid = QColor(160, 160, 160)
+
+        # column widths as StoryboardTable.update_geometry() sets them
+        table_top = rect.top() + self.COLUMN_HEADER_HEIGHT
+        row_height = (rect.height() - self.COLUMN_HEADER_HEIGHT - self.FOOTER_HEIGHT) / max(1, len(page.cuts))
+        number_width = rect.width() * 0.07
+        panel_width = min(row_height * 16 / 9, rect.width() - number_width)
+        rest_width = rect.width() - number_width - panel_width
+        widths = [number_width, panel_width, rest_width * 0.7, rest_width * 0.3]
+        lefts = list(itertools.accumulate([rect.left()] + widths[:-1]))
+
+        painter.setFont(self.font(11, bold=True))
+        for left, column_width, title in zip(lefts, widths, self.HEADERS):
+            cell = QRectF(left, rect.top(), column_width, self.COLUMN_HEADER_HEIGHT)
+            painter.fillRect(cell, QColor(240, 240, 240))
+            painter.setPen(grid)
+            painter.drawRect(cell)
+            painter.setPen(Qt.black)
+            painter.drawText(cell, Qt.AlignCenter, title)
+
+        painter.setFont(self.font(11))
+        for row, cut in enumerate(page.cuts):
+            y = table_top + row * row_height
+            cells = [QRectF(left, y, column_width, row_height) for left, column_width in zip(lefts, widths)]
+            painter.setPen(grid)
+            for cell in cells:
+                painter.drawRect(cell)
+            self.paint_panel(painter, cut, page.mode, cells[1].adjusted(2, 2, -2, -2))
+            painter.setPen(Qt.black)
+            painter.drawText(cells[0], Qt.AlignCenter, str(page.start_number + row))
+            painter.save()
+            painter.setClipRect(cells[2])
+            painter.drawText(cells[2].adjusted(6, 4, -6, -4), Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, cut.description)
+            painter.restore()
+            s, f = divmod(cut.frames, fps)
+            painter.drawText(cells[3], Qt.AlignCenter, f"( {s} + {f} )")
+
+        s, f = divmod(self.project.page_total_frames(page_index), fps)
+        painter.setFont(self.font(12, bold=True))
+        footer = QRectF(rect.left(), rect.bottom() - self.FOOTER_HEIGHT, rect.width() - 5, self.FOOTER_HEIGHT)
+        painter.drawText(footer, Qt.AlignRight | Qt.AlignVCenter, f"Total Duration: {s} s + {f} f")
+
+    def paint_panel(self, painter, cut, mode, rect):
+        # upload pages fit the panel into the cell, draw pages fill it, like ThumbnailDelegate
+        if not cut.has_image():
+            return
+        pixel_width, pixel_height = max(1, round(rect.width() * self.scale)), max(1, round(rect.height() * self.scale))
+        if cut.drawing is not None:
+            image = cut.drawing
+        else:
+            # only as much of the original as the printed size needs
+            try:
+                image = decode_working_image(image_store.get_blob(cut.stored), (pixel_width, pixel_height))
+            except Exception:
+                image = resolve_cut_image(None)
+        if mode != "draw":
+            ratio = image.width / image.height
+            if ratio > rect.width() / rect.height():
+                fitted = QSizeF(rect.width(), rect.width() / ratio)
+            else:
+                fitted = QSizeF(rect.height() * ratio, rect.height())
+            rect = QRectF(rect.center().x() - fitted.width() / 2, rect.center().y() - fitted.height() / 2,
+                          fitted.width(), fitted.height())
+            pixel_width, pixel_height = max(1, round(rect.width() * self.scale)), max(1, round(rect.height() * self.scale))
+        painter.drawImage(rect, pil_to_qimage(scale_image(image, pixel_width, pixel_height)))
 
-        draw.text(text_pos, text, font=font, fill=text_color)
+    @staticmethod
+    def font(pixel_size, bold=False):
+        font = QFont("Arial")
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
 
-        self.current_image = bg
-        self.elapsed_ms = 0  # reset timecode count on new frame
-        self.update_timecode_display(force=True)
-    
 
-    def update_timecode_display(self, force=False):
-        if not self.current_image:
-            return
+class VideoExportThread(QThread):
+    progress = Signal(int, int)
+    done = Signal(bool, str)  # ok, error message ("" when cancelled)
 
-        img = self.current_image.copy()
-        draw = ImageDraw.Draw(img)
+    def __init__(self, filename, cuts, fps=DEFAULT_FPS, size=EXPORT_SIZE, parent=None):
+        super().__init__(parent)
+        self.filename = filename
+        self.cuts = cuts
+        self.fps = fps
+        self.size = size
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
 
-        font_size = max(24, img.height // 20)
+    def run(self):
         try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        s, f = self.durations[self.current_index]
-        total_ms = int((s + f / self.fps) * 1000)
-        elapsed_ms = min(self.elapsed_ms, total_ms)
-        elapsed_sec = elapsed_ms // 1000
-        elapsed_frame = int((elapsed_ms % 1000) / (1000 / self.fps))
-
-        timecode_text = f"{elapsed_sec:02d}s + {elapsed_frame:02d}f"
-        margin = img.height // 30
-        x = margin
-        y = img.height - margin - font_size
+            ok = write_animatic(self.filename, self.cuts, self.fps, self.size,
+                                progress=self.progress.emit, is_cancelled=lambda: self.cancelled)
+            self.done.emit(ok, "")
+        except Exception as e:
+            self.done.emit(False, str(e))
+
+
+def dropped_paths(mime_data):
+    return [url.toLocalFile() for url in mime_data.urls() if url.isLocalFile()]
+
 
-        shadow_color = (0, 0, 0, 255)
-        text_color = (255, 255, 255, 255)
+class ImageImportThread(QThread):
+    # decodes the files of a bulk import to working resolution on a pool of threads (PIL releases the GIL
+    # while decoding and resampling) and hands each one to the GUI thread with its index in `files`.
+    # only a couple of files per worker are in flight, so a big folder never piles up decoded images
+    imported = Signal(int, object, bytes)  # index, working image, file bytes
+    progress = Signal(int, int)
+    done = Signal(list)  # files that could not be read
 
-        for offset in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
-            draw.text((x + offset[0], y + offset[1]), timecode_text, font=font, fill=shadow_color)
-        draw.text((x, y), timecode_text, font=font, fill=text_color)
+    def __init__(self, files, workers=EXPORT_WORKERS, parent=None):
+        super().__init__(parent)
+        self.files = files
+        self.workers = workers
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
 
-        # Draw description bottom-left aligned left
-        description = self.descriptions[self.current_index]
-        if description:
-            desc_font_size = max(18, img.height // 30)
+    @staticmethod
+    def load(index, path):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            return index, decode_working_image(data), data
+        except Exception:
+            return index, None, None
+
+    def run(self):
+        failed = []
+        finished_count = 0
+        files = iter(enumerate(self.files))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = set()
+            while True:
+                while len(pending) < self.workers * 2 and not self.cancelled:
+                    item = next(files, None)
+                    if item is None:
+                        break
+                    pending.add(pool.submit(self.load, *item))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, image, data = future.result()
+                    if image is None:
+                        failed.append(self.files[index])
+                    elif not self.cancelled:
+                        self.imported.emit(index, image, data)
+                    finished_count += 1
+                    self.progress.emit(finished_count, len(self.files))
+        self.done.emit(failed)
+
+
+def journal_line(data):
+    return compact_json(data).encode() + b"\n"
+
+
+def read_journal(path):
+    # (header, records, blobs by digest) of an autosave journal; a record cut short by a crash ends it
+    records = []
+    blobs = {}
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        while True:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
             try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-
-            desc_margin = 15
-            # Get bounding box: (left, top, right, bottom)
-            bbox = desc_font.getbbox(description)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            desc_pos = (img.width - desc_margin - text_width, img.height - desc_margin - text_height)
-
-                # Draw shadow for readability
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-
-             # Draw main text
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-            data = img.tobytes("raw", "RGBA")
-            qimg = QImage(data, img.width, img.height, QImage.Format_RGBA8888)
-            pixmap = QPixmap.fromImage(qimg)
-            self.label.setPixmap(pixmap.scaled(self.label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
-
-    def render_frame_for_export(self, index):
-        pil_image = self.frames[index]
-        target_w, target_h = 1920, 1080  # fixed export size
-        target_ratio = 16 / 9
-
-        bg = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 255))
-
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
+                record = json.loads(line)
+            except ValueError:
+                break
+            if record.get("op") == "blob":
+                data = f.read(record["size"])
+                if len(data) < record["size"]:
+                    break
+                blobs[record["digest"]] = data
             else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
+                records.append(record)
+    return header, records, blobs
+
+
+def apply_journal_record(project, record, images):
+    # images: digest -> encoded bytes, from the journal's blobs and the project it started from
+    if record["op"] == "meta":
+        project.title = record["title"]
+        project.fps = record["fps"]
+        pages = record["pages"]
+        del project.pages[len(pages):]
+        for index, (start_number, mode, rows) in enumerate(pages):
+            if index == len(project.pages):
+                project.add_page(start_number, mode)
+            page = project.pages[index]
+            page.start_number = start_number
+            page.mode = mode
+            page.cuts.extend(Cut() for _ in range(rows - len(page.cuts)))
+            del page.cuts[rows:]
+        project.reindex()
+        project.dirty.add("pages")
+    elif record["op"] == "row":
+        page_index, row = record["page"], record["row"]
+        cut = project.pages[page_index].cuts[row]
+        project.set_frames(page_index, row, record["frames"])
+        cut.set_description(record["description"])
+        image = images.get(record["image"]) if record["image"] else None
+        if record["drawing"] is not None:
+            cut.set_drawing(StrokeDrawing.from_data(record["drawing"], image))
+        elif image is not None:
+            cut.set_image(None, encoded=image)
+        elif cut.has_image():
+            cut.set_image(None)
+
+
+def recover_journal(stem):
+    # (project, project path) as they were when the journal was last written: the snapshot or the
+    # project file the journal started from, with its records replayed on top. recovered cuts are dirty
+    header, records, blobs = read_journal(stem + ".journal")
+    project_path = header.get("project")
+    if header.get("snapshot") and os.path.exists(stem + PROJECT_EXT):
+        project = Project.load(stem + PROJECT_EXT, backed=False)  # the snapshot goes with the journal
+    elif project_path and os.path.exists(project_path):
+        project = Project.load(project_path)
+    else:
+        project = Project()
+    images = dict(blobs)
+    for page in project.pages:
+        for cut in page.cuts:
+            data = cut.get_encoded()
+            if data is not None:
+                images.setdefault(content_digest(data, cut.stored.key if cut.stored is not None else None), data)
+    for record in records:
+        apply_journal_record(project, record, images)
+    return project, project_path
+
+
+def remove_journal_files(stem):
+    for path in (stem + ".journal", stem + PROJECT_EXT):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class JournalWriter(threading.Thread):
+    # the disk side of an autosave session. the GUI thread queues change records (holding image handles
+    # and drawings, which never change in place) and project snapshots; encoding, hashing, paging images
+    # in from the spill directory and all file writes happen here, in order.
+    #   <stem>.journal   header line, then one json line per record; image bytes follow their "blob" line
+    #   <stem>.csbp      snapshot the journal was last compacted into, if any
+
+    def __init__(self, stem, project_path):
+        super().__init__(name="autosave", daemon=True)
+        self.stem = stem
+        self.project_path = project_path
+        self.has_snapshot = False
+        self.known = set()  # digests the journal's base (project file or snapshot) or the journal has
+        self.file = None
+        self.queue = queue.Queue()
+
+    def submit(self, op, arg=None):
+        self.queue.put((op, arg))
+
+    def run(self):
+        while True:
+            op, arg = self.queue.get()
+            try:
+                if op == "base":
+                    self.known = self.project_digests(arg)
+                elif op == "records":
+                    self.append(arg)
+                elif op == "compact":
+                    self.compact(arg)
+                elif op == "discard":
+                    remove_journal_files(arg)
+                elif op == "close":
+                    if self.file is not None:
+                        self.file.close()
+                    if arg:
+                        remove_journal_files(self.stem)
+            except Exception as e:
+                # nothing to show it in from here; the next compaction starts over from a full snapshot
+                print(f"autosave: {e}", file=sys.stderr)
+            if op == "close":
+                return
+
+    def project_digests(self, project):
+        digests = {cut.image_digest() for page in project.pages for cut in page.cuts}
+        digests.discard(None)
+        return digests
+
+    def start_journal(self):
+        # a fresh journal holding only the header, swapped in whole
+        if self.file is not None:
+            self.file.close()
+        os.makedirs(os.path.dirname(self.stem), exist_ok=True)
+        path = self.stem + ".journal"
+        header = {"op": "header", "version": 1, "project": self.project_path, "snapshot": self.has_snapshot}
+        with open(path + ".tmp", "wb") as f:
+            f.write(journal_line(header))
+        os.replace(path + ".tmp", path)
+        self.file = open(path, "ab")
+
+    def append(self, records):
+        if self.file is None:
+            self.start_journal()
+        chunks = []
+        for record in records:
+            chunks.extend(self.encode(record))
+        self.file.write(b"".join(chunks))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def encode(self, record):
+        if record[0] == "meta":
+            _, title, fps, pages = record
+            yield journal_line({"op": "meta", "title": title, "fps": fps, "pages": pages})
+            return
+        _, page_index, row, frames, description, stored, drawing = record
+        data = {"op": "row", "page": page_index, "row": row, "frames": frames, "description": description,
+                "image": None, "drawing": None}
+        blob = None
+        key = None
+        if drawing is not None:
+            data["drawing"] = drawing.to_data()
+            blob = drawing.base
+        elif stored is not None:
+            blob = image_store.get_blob(stored)
+            key = stored.key
+        if blob is not None:
+            data["image"] = digest = content_digest(blob, key)
+            if digest not in self.known:
+                yield journal_line({"op": "blob", "digest": digest, "size": len(blob)})
+                yield blob
+                self.known.add(digest)
+        yield journal_line(data)
+
+    def compact(self, snapshot):
+        # everything so far goes into the snapshot, the journal starts over on top of it
+        snapshot.save(self.stem + PROJECT_EXT)
+        self.has_snapshot = True
+        self.known = self.project_digests(snapshot)
+        self.start_journal()
+
+
+class Autosave(QObject):
+    # GUI side of autosave: every AUTOSAVE_INTERVAL_MS the rows that changed since the last look are
+    # queued to a JournalWriter as full row states (cheap to compare, idempotent to replay), and every
+    # AUTOSAVE_COMPACT_RECORDS records the journal gets folded into a snapshot. nothing here touches the
+    # disk beyond the session's lock file; a clean stop deletes the journal, a crash leaves it for
+    # recover_journal() on the next start
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.project = None
+        self.writer = None
+        self.lock = None
+        self.meta = None  # last journaled (title, fps, pages)
+        self.rows = {}  # (page index, row) -> last journaled row state
+        self.records_since_compaction = 0
+
+    @staticmethod
+    def new_stem(project_path):
+        name = "untitled" if project_path is None else os.path.splitext(os.path.basename(project_path))[0]
+        return os.path.join(RECOVERY_DIR, f"{name}-{os.getpid()}-{int(time.time() * 1000)}")
+
+    def start(self, project, project_path=None, recovered_stem=None):
+        # a new session for project; a project recovered from another journal is snapshotted right
+        # away and that journal is only dropped once the snapshot is on disk
+        self.stop()
+        stem = self.new_stem(project_path)
+        os.makedirs(RECOVERY_DIR, exist_ok=True)
+        self.lock = QLockFile(stem + ".lock")
+        self.lock.tryLock(0)
+        self.project = project
+        self.writer = JournalWriter(stem, project_path)
+        self.writer.start()
+        if recovered_stem is not None:
+            self.compact()
+            self.writer.submit("discard", recovered_stem)
+        else:
+            self.writer.submit("base", project.snapshot())
+            self.meta = self.project_meta()
+            self.rows = self.row_states()
+        self.timer.start(AUTOSAVE_INTERVAL_MS)
+
+    def stop(self, discard=True, wait=False):
+        if self.writer is None:
+            return
+        self.timer.stop()
+        self.writer.submit("close", discard)
+        if wait:
+            self.writer.join()
+        self.writer = None
+        self.lock.unlock()
+        self.lock = None
+
+    def project_meta(self):
+        project = self.project
+        return project.title, project.fps, [[page.start_number, page.mode, len(page.cuts)] for page in project.pages]
+
+    def row_states(self):
+        return {(page_index, row): (cut.frames, cut.description, cut.stored, cut.drawing)
+                for page_index, page in enumerate(self.project.pages) for row, cut in enumerate(page.cuts)}
+
+    def tick(self):
+        records = []
+        meta = self.project_meta()
+        if meta != self.meta:
+            records.append(("meta",) + meta)
+            self.meta = meta
+        states = self.row_states()
+        for key, state in states.items():
+            if self.rows.get(key) != state:
+                records.append(("row",) + key + state)
+        self.rows = states
+        if not records:
+            return
+        self.writer.submit("records", records)
+        self.records_since_compaction += len(records)
+        if self.records_since_compaction >= AUTOSAVE_COMPACT_RECORDS:
+            self.compact()
+
+    def compact(self):
+        self.writer.submit("compact", self.project.snapshot())
+        self.meta = self.project_meta()
+        self.rows = self.row_states()
+        self.records_since_compaction = 0
 
-        draw = ImageDraw.Draw(bg)
 
-        # Draw storyboard number
-        font_size = max(24, target_h // 20)
+class ProjectSaveThread(QThread):
+    # saves a project snapshot (see Project.save) while editing goes on
+    done = Signal(bool, str)  # ok, error message
+
+    def __init__(self, project, filename, parent=None):
+        super().__init__(parent)
+        self.project = project
+        self.filename = filename
+        self.error = None  # set once run() is over: "" on success
+
+    def run(self):
         try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
+            self.project.save(self.filename)
+            self.error = ""
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+        self.done.emit(not self.error, self.error)
 
-        text = f"#{self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = (0, 0, 0, 255)
-        text_color = (255, 255, 255, 255)
 
-        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
-        draw.text(text_pos, text, font=font, fill=text_color)
-
-        # Draw description bottom-right
-        description = self.descriptions[index] if hasattr(self, "descriptions") else ""
-        if description:
-            desc_font_size = max(18, target_h // 30)
-            try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-            desc_w, desc_h = draw.textsize(description, font=desc_font)
-            desc_pos = (target_w - desc_w - 15, target_h - desc_h - 15)
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-
-        return bg
+class SpreadExportThread(QThread):
+    # renders every spread of a project snapshot to a PDF (filename) or an image sequence (a pattern for
+    # SpreadRenderer.write_images) while editing goes on
+    progress = Signal(int, int)
+    done = Signal(bool, str)  # ok, error message ("" when cancelled)
+
+    def __init__(self, project, filename, dpi=SPREAD_DPI, parent=None):
+        super().__init__(parent)
+        self.renderer = SpreadRenderer(project, dpi)
+        self.filename = filename
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            is_cancelled = lambda: self.cancelled
+            if self.filename.lower().endswith(".pdf"):
+                ok = self.renderer.write_pdf(self.filename, self.progress.emit, is_cancelled)
+            else:
+                ok = self.renderer.write_images(self.filename, self.progress.emit, is_cancelled) is not None
+            self.done.emit(ok, "")
+        except Exception as e:
+            self.done.emit(False, str(e))
+
 
 class StoryboardPlanner(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Crappy Storyboard Planner")
+        self.project = Project()
+        self.project_path = None  # last file saved to / loaded from
+        self.import_thread = None
+        self.autosave = None  # see enable_autosave()
+        self.save_thread = None
+        self.saving_project = None  # the project save_thread is saving a snapshot of
+        self.setAcceptDrops(True)  # image files/folders dropped outside the tables go to the first free cut
  
 
         self.main_widget = QWidget()
@@ -818,20 +3138,46 @@ class StoryboardPlanner(QMainWindow):
         file_menu = menubar.addMenu("File")
 
         save_action = QAction("Save Project", self)
-        save_action.triggered.connect(self.save_project)
+        save_action.setShortcut("Ctrl+S")
+        save_action.triggered.connect(lambda: self.save_project())
         file_menu.addAction(save_action)
 
+        save_as_action = QAction("Save Project As...", self)
+        save_as_action.triggered.connect(lambda: self.save_project_as())
+        file_menu.addAction(save_as_action)
+
         load_action = QAction("Load Project", self)
         load_action.triggered.connect(self.load_project)
         file_menu.addAction(load_action)
 
-        export_video_action = QAction("i wouldve made export mp4 but idk how", self)
+        file_menu.addSeparator()
+
+        import_files_action = QAction("Import Images...", self)
+        import_files_action.triggered.connect(self.import_image_files)
+        file_menu.addAction(import_files_action)
+
+        import_folder_action = QAction("Import Folder...", self)
+        import_folder_action.triggered.connect(self.import_image_folder)
+        file_menu.addAction(import_folder_action)
+
+        import_pattern_action = QAction("Import Matching Files...", self)
+        import_pattern_action.triggered.connect(self.import_image_pattern)
+        file_menu.addAction(import_pattern_action)
+
+        file_menu.addSeparator()
+
+        export_video_action = QAction("Export Animatic (MP4)", self)
+        export_video_action.triggered.connect(self.export_video)
         file_menu.addAction(export_video_action)
 
         export_spread_action = QAction("Export Spread (JPG/PNG)", self)
         export_spread_action.triggered.connect(self.export_spread)
         file_menu.addAction(export_spread_action)
 
+        export_spreads_action = QAction("Export All Spreads (PDF/Images)...", self)
+        export_spreads_action.triggered.connect(self.export_all_spreads)
+        file_menu.addAction(export_spreads_action)
+
         top_bar = QHBoxLayout()
         self.main_layout.addLayout(top_bar)
 
@@ -839,6 +3185,7 @@ class StoryboardPlanner(QMainWindow):
         # Title box
         self.title_edit = QLineEdit()
         self.title_edit.setPlaceholderText("Title: Enter storyboard title here...")
+        self.title_edit.textChanged.connect(self.on_title_changed)
         top_bar.addWidget(self.title_edit)
 
         self.mode_combo = QComboBox()
@@ -868,26 +3215,30 @@ class StoryboardPlanner(QMainWindow):
         self.page_label.setAlignment(Qt.AlignCenter)
         self.pagination_layout.addWidget(self.page_label, 1)
 
+        self.project_total_label = QLabel()
+        self.project_total_label.setStyleSheet("font-weight: bold;")
+        self.pagination_layout.addWidget(self.project_total_label)
+
         self.next_btn = QPushButton("Next")
         self.next_btn.clicked.connect(self.go_next)
         self.pagination_layout.addWidget(self.next_btn)
 
+        self.add_page_btn = QPushButton("Add Page")
+        self.add_page_btn.clicked.connect(self.add_page)
+        self.pagination_layout.addWidget(self.add_page_btn)
+
         self.play_btn = QPushButton("Play")
         self.play_btn.clicked.connect(self.play_storyboard)
         self.pagination_layout.addWidget(self.play_btn)
 
-        self.pages = []
+        # two page views for the two halves of a spread, rebound to other pages as the spread changes,
+        # so the widget count doesn't depend on the project length
+        self.page_views = []
         self.page_containers = []
         self.total_labels = []
 
-        
-
-        for page in self.pages:
-           page.update_geometry()
-
-        for i in range(TOTAL_PAGES):
-            start_num = i * ROWS_PER_PAGE + 1
-            page = StoryboardTable(page_number=i + 1, fps=DEFAULT_FPS, start_number=start_num)
+        for side in range(2):
+            page = StoryboardTable(self.project, side)
             total_label = QLabel("Total Duration: 0 s + 0 f")
             total_label.setAlignment(Qt.AlignRight)
             total_label.setStyleSheet("font-weight: bold; padding-right: 5px;")
@@ -898,8 +3249,9 @@ class StoryboardPlanner(QMainWindow):
             vlayout.setSpacing(2)
             vlayout.addWidget(page)
             vlayout.addWidget(total_label)
+            self.spread_layout.addWidget(container, 1)
 
-            self.pages.append(page)
+            self.page_views.append(page)
             self.total_labels.append(total_label)
             self.page_containers.append(container)
 
@@ -911,14 +3263,14 @@ class StoryboardPlanner(QMainWindow):
         self.on_mode_changed(self.mode_combo.currentIndex())
 
 
+    def on_title_changed(self, text):
+        self.project.set_title(text)
+
     def on_mode_changed(self, index):
         mode_text = self.mode_combo.currentText()
-        if "Draw" in mode_text:
-            for page in self.pages:
-                page.switch_to_draw_mode()
-        else:
-            for page in self.pages:
-                page.switch_to_upload_mode()
+        self.project.set_mode("draw" if "Draw" in mode_text else "upload")
+        for page in self.page_views:
+            page.refresh_cells()
         self.update_view()
 
 
@@ -934,48 +3286,35 @@ class StoryboardPlanner(QMainWindow):
             )
             self.current_brush_color = rgba
             # Update all drawing widgets brush color
-            for page in self.pages:
-                for dw in page.draw_widgets:
-                    if dw:
-                        dw.set_brush_color(rgba)
+            for page in self.page_views:
+                page.brush_color = rgba
 
     def brush_size_changed(self, value):
         self.current_brush_size = value
-        for page in self.pages:
-            for dw in page.draw_widgets:
-                if dw:
-                    dw.brush_size = value
+        for page in self.page_views:
+            page.brush_size = value
 
     def eraser_toggled(self, checked):
         self.eraser_mode = checked
-        for page in self.pages:
-            for dw in page.draw_widgets:
-                if dw:
-                    dw.set_eraser_mode(checked)
+        for page in self.page_views:
+            page.eraser_mode = checked
 
     def update_view(self):
-        for i in reversed(range(self.spread_layout.count())):
-            item = self.spread_layout.takeAt(i)
-            widget = item.widget()
-            if widget:
-                widget.hide()
-
+        total_spreads = self.spread_count()
+        self.current_spread_index = min(self.current_spread_index, total_spreads - 1)
         left_idx = self.current_spread_index * 2
-        right_idx = left_idx + 1
 
-        def show_page(idx):
-            if idx < 0 or idx >= len(self.page_containers):
-                return
-            container = self.page_containers[idx]
-            s, f = self.pages[idx].update_page_total_duration()
-            self.total_labels[idx].setText(f"Total Duration: {s} s + {f} f")
+        for side, page in enumerate(self.page_views):
+            idx = left_idx + side
+            container = self.page_containers[side]
+            if idx >= len(self.project.pages):
+                container.hide()
+                continue
+            page.bind(self.project, idx)
+            self.update_totals_for_page(page)
             container.show()
-            self.spread_layout.addWidget(container, 1)
+        self.update_project_total()
 
-        show_page(left_idx)
-        show_page(right_idx)
-
-        total_spreads = (len(self.pages) + 1) // 2
         self.page_label.setText(f"Spread {self.current_spread_index + 1} / {total_spreads}")
 
         self.prev_btn.setEnabled(self.current_spread_index > 0)
@@ -983,11 +3322,16 @@ class StoryboardPlanner(QMainWindow):
 
     def update_totals_for_page(self, page):
         try:
-            idx = self.pages.index(page)
+            idx = self.page_views.index(page)
         except ValueError:
             return
         s, f = page.update_page_total_duration()
         self.total_labels[idx].setText(f"Total Duration: {s} s + {f} f")
+        self.update_project_total()
+
+    def update_project_total(self):
+        s, f = self.project.split_frames(self.project.total_frames())
+        self.project_total_label.setText(f"Project: {s} s + {f} f")
 
     def go_previous(self):
         if self.current_spread_index > 0:
@@ -995,269 +3339,465 @@ class StoryboardPlanner(QMainWindow):
             self.update_view()
 
     def go_next(self):
-        total_spreads = (len(self.pages) + 1) // 2
-        if self.current_spread_index < total_spreads - 1:
+        if self.current_spread_index < self.spread_count() - 1:
             self.current_spread_index += 1
             self.update_view()
 
-    def play_storyboard(self):
-        frames = []
-        durations = []
-        numbers = []
-        descriptions = []
-
-        for page in self.pages:
-            for i in range(ROWS_PER_PAGE):
-                s, f = page.duration_widgets[i].get_duration()
-
-                # Force a minimum duration if the user hasn't set one
-                if s == 0 and f == 0:
-                    continue 
-
-                img = page.uploaded_images[i]
-                if img is None:
-                    img = Image.new("RGBA", (800, 450), (255, 255, 255, 255))
-
-                frames.append(img)
-                durations.append((s, f))
-                storyboard_number = page.start_number + i
-                numbers.append(storyboard_number)
-
-                # Always add description, even if it's empty
-                desc_item = page.item(i, 2)
-                descriptions.append(desc_item.text() if desc_item else "")
+    def add_page(self):
+        self.project.add_page(mode=self.project.pages[-1].mode)
+        # jump to the spread holding the new page
+        self.current_spread_index = self.spread_count() - 1
+        self.update_view()
 
-        if not frames:
+    def collect_cuts(self):
+        return self.project.playback_cuts()
+
+    def import_image_files(self):
+        files, _ = QFileDialog.getOpenFileNames(
+            self, "Import Images", "", "Images (" + " ".join("*" + ext for ext in IMAGE_EXTENSIONS) + ")")
+        if files:
+            self.import_images(files)
+
+    def import_image_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Import Folder")
+        if folder:
+            self.import_images([folder])
+
+    def import_image_pattern(self):
+        pattern, ok = QInputDialog.getText(self, "Import Matching Files", "File pattern (e.g. C:/boards/sc01_*.png):")
+        if ok and pattern.strip():
+            self.import_images([pattern.strip()])
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        paths = dropped_paths(event.mimeData())
+        if paths:
+            event.acceptProposedAction()
+            self.import_images(paths)
+
+    def import_images(self, sources, page_index=None, row=None):
+        # fills consecutive cuts with the images found in sources (see collect_image_files), from
+        # (page_index, row) or else the first free cut of the current spread on, adding pages as needed
+        if self.import_thread is not None:
+            return
+        if self.project.pages[0].mode == "draw":
+            QMessageBox.warning(self, "Import Images", "Switch to Upload mode to import images.")
+            return
+        files = collect_image_files(sources)
+        if not files:
+            QMessageBox.warning(self, "Import Images", "No images found.")
             return
 
-        self.player = PlayerWindow(frames, durations, numbers, descriptions, fps=DEFAULT_FPS)
-        self.player.show()
+        if page_index is None:
+            page_index, row = self.project.first_free_cut(self.current_spread_index * 2)
+        cuts = self.project.cuts_from(page_index, row, len(files))
+        self.update_view()  # pages may have been added
+
+        progress = QProgressDialog("Importing images...", "Cancel", 0, len(files), self)
+        progress.setWindowTitle("Import Images")
+        progress.setMinimumDuration(500)
+
+        thread = ImageImportThread(files, parent=self)
+        thread.progress.connect(lambda done, total: progress.setValue(done))
+        progress.canceled.connect(thread.cancel)
+
+        def imported(index, image, data):
+            cut = cuts[index]
+            cut.set_image(image, encoded=data)
+            for view in self.page_views:
+                view.page_model.refresh_image_key(cut.image_key)
+
+        def finished(failed):
+            progress.reset()
+            if failed:
+                names = "\n".join(os.path.basename(path) for path in failed[:20])
+                more = f"\n... and {len(failed) - 20} more" if len(failed) > 20 else ""
+                QMessageBox.warning(self, "Import Images", f"Could not read {len(failed)} file(s):\n{names}{more}")
+            thread.deleteLater()
+            self.import_thread = None
+
+        thread.imported.connect(imported)
+        thread.done.connect(finished)
+        self.import_thread = thread  # keep a reference while it runs
+        thread.start()
 
-    def save_project(self):
-        filename, _ = QFileDialog.getSaveFileName(self, "Save Project", "", "Storyboard Project (*.json)")
-        if not filename:
+    def play_storyboard(self):
+        cuts = self.collect_cuts()
+        if not cuts:
             return
-        if not filename.endswith(".json"):
-            filename += ".json"
 
-        data = {
-            "title": self.title_edit.text(),
-            "pages": []
-        }
-
-        for page in self.pages:
-            page_data = {
-                "start_number": page.start_number,
-                "mode": page.mode,
-                "rows": []
-            }
-            for row in range(ROWS_PER_PAGE):
-                s, f = page.duration_widgets[row].get_duration()
-                description = page.item(row, 2).text() if page.item(row, 2) else ""
-                img_data = None
-                if page.uploaded_images[row]:
-                    with io.BytesIO() as output:
-                        page.uploaded_images[row].save(output, format="PNG")
-                        img_bytes = output.getvalue()
-                    img_data = img_bytes.hex()
-                row_data = {
-                    "duration": (s, f),
-                    "description": description,
-                    "image_data": img_data,
-                    "mode": page.mode,
-                }
-                page_data["rows"].append(row_data)
-            data["pages"].append(page_data)
-
-        try:
-            with open(filename, "w") as f:
-                json.dump(data, f)
-            QMessageBox.information(self, "Save Project", "Project saved successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Save Project", f"Failed to save project:\n{str(e)}")
+        # the player decodes the panels it is about to show, the store keeps the rest off the heap
+        frames = [image for image, _, _, _ in cuts]
+        cut_frames = [length for _, length, _, _ in cuts]
+        numbers = [number for _, _, number, _ in cuts]
+        descriptions = [description for _, _, _, description in cuts]
 
+        self.player = PlayerWindow(frames, cut_frames, numbers, descriptions, fps=self.project.fps)
+        self.player.show()
 
+    def save_project(self, wait=False):
+        # legacy .json files get converted on their first save; a project file that is up to date is
+        # left alone. True if the save went ahead (with wait: if the project is saved afterwards)
+        if self.project_path and self.project_path.endswith(PROJECT_EXT):
+            if not self.project.is_dirty():
+                return self.finish_save() if wait else True
+            return self.write_project(self.project_path, wait)
+        return self.save_project_as(wait)
+
+    def save_project_as(self, wait=False):
+        filename, _ = QFileDialog.getSaveFileName(self, "Save Project", "", f"Storyboard Project (*{PROJECT_EXT})")
+        if not filename:
+            return False
+        if not filename.endswith(PROJECT_EXT):
+            filename += PROJECT_EXT
+        return self.write_project(filename, wait)
+
+    def maybe_save(self):
+        # before the current project is closed or replaced; False if the user cancelled
+        if not self.project.is_dirty():
+            return True
+        answer = QMessageBox.question(
+            self, "Unsaved Changes", "The storyboard has unsaved changes. Save them first?",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel, QMessageBox.Save)
+        if answer == QMessageBox.Cancel:
+            return False
+        if answer == QMessageBox.Save:
+            return self.save_project(wait=True)
+        return True
+
+    def write_project(self, filename, wait=False):
+        # the file is written from a snapshot on a ProjectSaveThread, so editing can go on meanwhile; the
+        # project counts as clean from the snapshot on and turns dirty again if the save fails
+        self.finish_save()  # saves happen one at a time, in order
+        project = self.project
+        thread = ProjectSaveThread(project.snapshot(), filename, parent=self)
+        project.mark_clean()
+        self.project_path = filename
+        thread.done.connect(lambda ok, error: self.save_finished(thread))
+        self.save_thread = thread
+        self.saving_project = project
+        thread.start()
+        return self.finish_save() if wait else True
+
+    def finish_save(self):
+        # waits for a save still running; True unless it failed
+        thread = self.save_thread
+        if thread is None:
+            return True
+        thread.wait()
+        return self.save_finished(thread)
+
+    def save_finished(self, thread):
+        # once per ProjectSaveThread, from its done signal or from finish_save(), whichever comes first
+        if self.save_thread is not thread:
+            return True
+        project = self.saving_project
+        self.save_thread = None
+        self.saving_project = None
+        thread.deleteLater()
+        if thread.error:
+            project.dirty.add("save")
+            QMessageBox.critical(self, "Save Project", f"Failed to save project:\n{thread.error}")
+            return False
+        if self.autosave is not None and project is self.project:
+            self.autosave.start(project, thread.filename)  # the old journal is covered by the saved file now
+        QMessageBox.information(self, "Save Project", "Project saved successfully.")
+        return True
 
     def load_project(self):
-        filename, _ = QFileDialog.getOpenFileName(self, "Load Project", "", "Storyboard Project (*.json)")
+        if not self.maybe_save():
+            return
+        filename, _ = QFileDialog.getOpenFileName(
+            self, "Load Project", "",
+            f"Storyboard Project (*{PROJECT_EXT} *.json);;Legacy JSON Project (*.json)"
+        )
         if not filename:
             return
 
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
+            self.open_project(filename)
         except Exception as e:
             QMessageBox.critical(self, "Load Project", f"Failed to load project:\n{str(e)}")
             return
 
-        self.title_edit.setText(data.get("title", ""))
-
-        pages_data = data.get("pages", [])
-        for i, page_data in enumerate(pages_data):
-            if i >= len(self.pages):
-                break
-            page = self.pages[i]
-            page.start_number = page_data.get("start_number", page.start_number)
-            mode = page_data.get("mode", "upload")
-            if "draw" in mode:
-                page.switch_to_draw_mode()
-            else:
-                page.switch_to_upload_mode()
-            rows = page_data.get("rows", [])
-            for row_idx, row_data in enumerate(rows):
-                if row_idx >= ROWS_PER_PAGE:
-                    break
-                s, f = row_data.get("duration", (0, 0))
-                page.duration_widgets[row_idx].seconds_edit.setText(str(s))
-                page.duration_widgets[row_idx].frames_edit.setText(str(f))
-                description = row_data.get("description", "")
-                if page.item(row_idx, 2):
-                    page.item(row_idx, 2).setText(description)
-                else:
-                    page.setItem(row_idx, 2, QTableWidgetItem(description))
-
-                img_data_hex = row_data.get("image_data")
-                if img_data_hex:
-                    img_bytes = bytes.fromhex(img_data_hex)
-                    img = Image.open(io.BytesIO(img_bytes)).convert("RGBA")
-                    page.uploaded_images[row_idx] = img
-                    if page.mode == "upload":
-                        cell_width = page.columnWidth(1) or 150
-                        cell_height = page.rowHeight(row_idx) or 50
-                        qt_pixmap = page.pil_to_qpixmap_scaled(img, cell_width, cell_height)
-                        btn = page.create_fixed_size_button(pixmap=qt_pixmap, row=row_idx)
-                        btn.setFixedSize(cell_width, cell_height)
-                        page.setCellWidget(row_idx, 1, btn)
-                    elif page.mode == "draw":
-                        dw = DrawingWidget(page.columnWidth(1), page.rowHeight(row_idx))
-                        dw.image = img.resize((dw.width(), dw.height()), Image.LANCZOS)
-                        dw.draw = ImageDraw.Draw(dw.image)
-                        dw.update_pixmap()
-                        page.draw_widgets[row_idx] = dw
-                        page.setCellWidget(row_idx, 1, dw)
-                else:
-                    page.uploaded_images[row_idx] = None
-                    if page.mode == "upload":
-                        page._add_upload_button(row_idx)
-                    else:
-                        if page.draw_widgets[row_idx] is None:
-                            dw = DrawingWidget(page.columnWidth(1), page.rowHeight(row_idx))
-                            page.draw_widgets[row_idx] = dw
-                            page.setCellWidget(row_idx, 1, dw)
-
-        self.update_view()
         QMessageBox.information(self, "Load Project", "Project loaded successfully.")
 
+    def open_project(self, filename):
+        project = Project.load(filename)
+        self.project_path = filename
+        self.set_project(project)
 
-    def render_frame_for_export(self, index):
-        from PIL import Image, ImageDraw, ImageFont
-
-        pil_image = self.frames[index]
-        target_w, target_h = 1920, 1080
-        target_ratio = 16 / 9
-
-        bg = Image.new("RGBA", (target_w, target_h), (0, 0, 0, 255))
-
-        if pil_image:
-            img_ratio = pil_image.width / pil_image.height
-            if img_ratio > target_ratio:
-                new_w = target_w
-                new_h = int(target_w / img_ratio)
-            else:
-                new_h = target_h
-                new_w = int(target_h * img_ratio)
-            resized_img = pil_image.resize((new_w, new_h), Image.LANCZOS)
-            x_offset = (target_w - new_w) // 2
-            y_offset = (target_h - new_h) // 2
-            bg.paste(resized_img, (x_offset, y_offset))
-
-        draw = ImageDraw.Draw(bg)
-
-        # Storyboard number
-        font_size = max(24, target_h // 20)
-        try:
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except IOError:
-            font = ImageFont.load_default()
-
-        text = f"#{self.numbers[index]}"
-        margin = 10
-        text_pos = (margin, margin)
-        shadow_color = (0, 0, 0, 255)
-        text_color = (255, 255, 255, 255)
-
-        for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-            pos = (text_pos[0] + offset[0], text_pos[1] + offset[1])
-            draw.text(pos, text, font=font, fill=shadow_color)
-        draw.text(text_pos, text, font=font, fill=text_color)
-
-        # Description bottom-right
-        description = getattr(self, "descriptions", [""] * len(self.frames))[index]
-        if description:
-            desc_font_size = max(18, target_h // 30)
+    def set_project(self, project, recovered_stem=None):
+        self.project = project
+        self.title_edit.setText(project.title)
+        if recovered_stem is None:
+            project.mark_clean()
+        self.current_spread_index = 0
+        self.update_view()
+        if self.autosave is not None:
+            self.autosave.start(project, self.project_path, recovered_stem)
+
+    def enable_autosave(self):
+        # GUI sessions only, offscreen renders don't journal. offers to recover what a crashed session
+        # left behind before starting on the current project
+        self.autosave = Autosave(self)
+        if not self.recover_autosave():
+            self.autosave.start(self.project, self.project_path)
+
+    def recover_autosave(self):
+        journals = sorted(glob.glob(os.path.join(RECOVERY_DIR, "*.journal")), key=os.path.getmtime, reverse=True)
+        for journal in journals:
+            stem = journal[:-len(".journal")]
+            lock = QLockFile(stem + ".lock")
+            if not lock.tryLock(0):
+                continue  # its session is still running
             try:
-                desc_font = ImageFont.truetype("arial.ttf", desc_font_size)
-            except IOError:
-                desc_font = ImageFont.load_default()
-            desc_w, desc_h = draw.textbbox((0, 0), description, font=desc_font)[2:]
-            desc_pos = (target_w - desc_w - 15, target_h - desc_h - 15)
-            for offset in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
-                pos = (desc_pos[0] + offset[0], desc_pos[1] + offset[1])
-                draw.text(pos, description, font=desc_font, fill=shadow_color)
-            draw.text(desc_pos, description, font=desc_font, fill=text_color)
-
-        return bg
-        
-        
-        
-
-
-    def export_spread(self):
-        left_idx = self.current_spread_index * 2
-        right_idx = left_idx + 1
-
-        containers_to_export = []
-        if left_idx < len(self.page_containers):
-            containers_to_export.append(self.page_containers[left_idx])
-        if right_idx < len(self.page_containers):
-            containers_to_export.append(self.page_containers[right_idx])
+                header = read_journal(journal)[0]
+                name = header.get("project") or "an untitled project"
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(os.path.getmtime(journal)))
+                answer = QMessageBox.question(
+                    self, "Recover Autosave",
+                    f"The storyboard was not closed properly.\nRecover unsaved changes to {name} from {when}?")
+                if answer == QMessageBox.Yes:
+                    project, self.project_path = recover_journal(stem)
+                    self.set_project(project, recovered_stem=stem)
+                    return True
+                remove_journal_files(stem)
+            except Exception as e:
+                QMessageBox.critical(self, "Recover Autosave", f"Failed to recover autosave:\n{str(e)}")
+                remove_journal_files(stem)
+            finally:
+                lock.unlock()
+        return False
+
+    def closeEvent(self, event):
+        if not self.finish_save() or not self.maybe_save():
+            event.ignore()
+            return
+        # a clean exit leaves no journal behind, only crashes do
+        if self.autosave is not None:
+            self.autosave.stop(wait=True)
+        super().closeEvent(event)
+
+    def export_video(self):
+        cuts = self.collect_cuts()
+        if not cuts:
+            QMessageBox.warning(self, "Export Animatic", "Nothing to export, every cut has a zero duration.")
+            return
 
-        if not containers_to_export:
-            QMessageBox.warning(self, "Export Spread", "No spread to export.")
+        filename, _ = QFileDialog.getSaveFileName(self, "Export Animatic", "", "MPEG-4 Video (*.mp4)")
+        if not filename:
             return
+        if not filename.lower().endswith(".mp4"):
+            filename += ".mp4"
+
+        total_frames = sum(frames for _, frames, _, _ in cuts)
+        progress = QProgressDialog("Exporting animatic...", "Cancel", 0, total_frames, self)
+        progress.setWindowTitle("Export Animatic")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        thread = VideoExportThread(filename, cuts, fps=self.project.fps, parent=self)
+        thread.progress.connect(lambda done, total: progress.setValue(done))
+        progress.canceled.connect(thread.cancel)
+
+        def finished(ok, message):
+            progress.reset()
+            if ok:
+                QMessageBox.information(self, "Export Animatic", f"Animatic exported successfully to:\n{filename}")
+            elif message:
+                QMessageBox.critical(self, "Export Animatic", f"Failed to export animatic:\n{message}")
+            thread.deleteLater()
+            self.export_thread = None
+
+        thread.done.connect(finished)
+        self.export_thread = thread  # keep a reference while it runs
+        thread.start()
+
+    def spread_count(self):
+        return (len(self.project.pages) + 1) // 2
 
+    def export_spread(self):
         filename, filter_ = QFileDialog.getSaveFileName(self, "Export Spread as Image", "", "PNG Image (*.png);;JPEG Image (*.jpg)")
         if not filename:
             return
 
-        # Export both pages in spread horizontally combined
-        pixmaps = [container.grab() for container in containers_to_export]
-        total_width = sum(p.width() for p in pixmaps)
-        max_height = max(p.height() for p in pixmaps)
-
-        result_img = QPixmap(total_width, max_height)
-        result_img.fill(Qt.transparent)
-        painter = QPainter(result_img)
-
-        x_offset = 0
-        for p in pixmaps:
-            painter.drawPixmap(x_offset, 0, p)
-            x_offset += p.width()
-        painter.end()
-
+        result_img = SpreadRenderer(self.project).render_image(self.current_spread_index)
         if filename.lower().endswith(".jpg") or filename.lower().endswith(".jpeg"):
-            result_img.save(filename, "JPEG")
+            ok = result_img.save(filename, "JPEG")
         else:
-            result_img.save(filename, "PNG")
+            ok = result_img.save(filename, "PNG")
+        if not ok:
+            QMessageBox.critical(self, "Export Spread", f"Failed to write:\n{filename}")
+            return
 
         QMessageBox.information(self, "Export Spread", f"Spread exported successfully to:\n{filename}")
 
+    def export_all_spreads(self):
+        filename, filter_ = QFileDialog.getSaveFileName(
+            self, "Export All Spreads", "", "PDF Document (*.pdf);;PNG Image Sequence (*.png);;JPEG Image Sequence (*.jpg)")
+        if not filename:
+            return
+        root, ext = os.path.splitext(filename)
+        if ext.lower() not in (".pdf", ".png", ".jpg", ".jpeg"):
+            ext = ".pdf" if "PDF" in filter_ else ".jpg" if "JPEG" in filter_ else ".png"
+            filename = root + ext
+        target = filename if ext.lower() == ".pdf" else root + "_{:03d}" + ext  # board.png -> board_001.png, ...
+
+        renderer_project = self.project.snapshot()
+        progress = QProgressDialog("Exporting spreads...", "Cancel", 0, (len(renderer_project.pages) + 1) // 2, self)
+        progress.setWindowTitle("Export All Spreads")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+
+        thread = SpreadExportThread(renderer_project, target, parent=self)
+        thread.progress.connect(lambda done, total: progress.setValue(done))
+        progress.canceled.connect(thread.cancel)
+
+        def finished(ok, message):
+            progress.reset()
+            if ok:
+                QMessageBox.information(self, "Export All Spreads", f"Spreads exported successfully to:\n{filename}")
+            elif message:
+                QMessageBox.critical(self, "Export All Spreads", f"Failed to export spreads:\n{message}")
+            thread.deleteLater()
+            self.spread_thread = None
+
+        thread.done.connect(finished)
+        self.spread_thread = thread  # keep a reference while it runs
+        thread.start()
+
+
+def read_project_cuts(filename):
+    # (cuts, fps): the same cut list StoryboardPlanner.collect_cuts() builds, straight from the file, no Qt
+    project = Project.load(filename, lazy=True)
+    return project.playback_cuts(), project.fps
+
+
+def ensure_offscreen_app():
+    # spreads are painted with Qt fonts, which need an application object; batch renders never show a
+    # window so they go through the offscreen platform (the mp4 path doesn't touch Qt at all)
+    app = QApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QApplication([sys.argv[0]])
+    return app
+
+
+def output_path(template, project_path, extension, multiple):
+    # "{name}" in the template is replaced by the project's file name; with several projects and no
+    # placeholder the template is taken as a directory
+    name = os.path.splitext(os.path.basename(project_path))[0]
+    if "{name}" in template:
+        return template.format(name=name)
+    if multiple or os.path.isdir(template):
+        return os.path.join(template, name + extension)
+    return template
+
+
+def render_project(project_path, mp4=None, spreads=None, spread_format="png", frame_workers=None, dpi=SPREAD_DPI):
+    cuts = None
+    results = []
+    if mp4:
+        cuts, fps = read_project_cuts(project_path)
+        if cuts:
+            os.makedirs(os.path.dirname(os.path.abspath(mp4)), exist_ok=True)
+            write_animatic(mp4, cuts, fps, workers=frame_workers)
+            results.append(mp4)
+        else:
+            results.append("no cuts with a duration, mp4 skipped")
+
+    if spreads:
+        ensure_offscreen_app()
+        renderer = SpreadRenderer(Project.load(project_path), dpi)
+        os.makedirs(spreads, exist_ok=True)
+        if spread_format == "pdf":
+            filename = os.path.join(spreads, "spreads.pdf")
+            renderer.write_pdf(filename)
+            results.append(filename)
+        else:
+            results.extend(renderer.write_images(os.path.join(spreads, "spread_{:03d}." + spread_format)))
+
+    return project_path, results
+
+
+def render_command(argv):
+    parser = argparse.ArgumentParser(prog="csbp_v1.py render", description="Render storyboard projects without the GUI.")
+    parser.add_argument("projects", nargs="+", help=f"project files ({PROJECT_EXT} or legacy .json)")
+    parser.add_argument("--mp4", help="animatic output file; may contain {name}, a directory when rendering several projects")
+    parser.add_argument("--spreads", help="directory for spread images; a subdirectory per project when rendering several")
+    parser.add_argument("--spread-format", choices=["png", "jpg", "pdf"], default="png",
+                        help="an image per spread, or all spreads as pages of one spreads.pdf")
+    parser.add_argument("--dpi", type=int, default=SPREAD_DPI, help=f"spread resolution (default: {SPREAD_DPI})")
+    parser.add_argument("--jobs", type=int, default=0, help="projects rendered at once (default: one per core, up to the project count)")
+    args = parser.parse_args(argv)
+
+    if not args.mp4 and not args.spreads:
+        parser.error("nothing to do, pass --mp4 and/or --spreads")
+
+    multiple = len(args.projects) > 1
+    jobs = args.jobs or min(len(args.projects), EXPORT_WORKERS)
+    frame_workers = max(1, EXPORT_WORKERS // jobs)  # split the cores between projects and their frame pools
+
+    tasks = []
+    for project_path in args.projects:
+        mp4 = output_path(args.mp4, project_path, ".mp4", multiple) if args.mp4 else None
+        spreads = None
+        if args.spreads:
+            spreads = args.spreads
+            if multiple:
+                spreads = os.path.join(args.spreads, os.path.splitext(os.path.basename(project_path))[0])
+        tasks.append((project_path, mp4, spreads, args.spread_format, frame_workers, args.dpi))
+
+    failures = 0
+    if jobs <= 1:
+        outcomes = []
+        for task in tasks:
+            try:
+                outcomes.append((task[0], render_project(*task)[1], None))
+            except Exception as e:
+                outcomes.append((task[0], None, e))
+        outcomes = iter(outcomes)
+    else:
+        # one process per project: each gets its own (offscreen) QApplication and frame pool
+        pool = ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn"))
+        futures = [(task[0], pool.submit(render_project, *task)) for task in tasks]
+
+        def wait_all():
+            for project_path, future in futures:
+                try:
+                    yield project_path, future.result()[1], None
+                except Exception as e:
+                    yield project_path, None, e
+            pool.shutdown()
+
+        outcomes = wait_all()
+
+    for project_path, results, error in outcomes:
+        if error is not None:
+            failures += 1
+            print(f"{project_path}: FAILED: {error}", file=sys.stderr)
+        else:
+            for result in results:
+                print(f"{project_path}: {result}")
 
-        
-        
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "render":
+        return render_command(argv[1:])
 
-if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = StoryboardPlanner()
     window.show()
-    sys.exit(app.exec())
+    window.enable_autosave()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())